@@ -2,16 +2,23 @@
 API route handlers
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+import asyncio
+import hashlib
+import time
 import uuid
 from datetime import datetime
 
+import orjson
+
 from app.models.scenario import (
     BuyingScenarioInput,
     InvestmentScenarioInput,
     ComparisonInput,
+    BatchInput,
     ForecastParams
 )
 from app.models.results import (
@@ -20,11 +27,56 @@ from app.models.results import (
     SimulationStatus,
     ErrorResponse
 )
-from app.services.simulation import SimulationService
+from app.services.simulation import SimulationService, result_cache
 from app.core.config import settings
+from app.core.responses import dumps
 
 router = APIRouter()
 
+
+def _json_blob(payload: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Serialize a static payload once and derive a strong ETag from its bytes"""
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return a pre-serialized JSON body, or 304 if the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Per-response fields; everything else in a ResultsResponse is the cacheable results payload
+_ENVELOPE_FIELDS = ("simulation_id", "status", "created_at", "completed_at")
+
+
+def _cache_payload(key: str, response: ResultsResponse, started: float) -> bytes:
+    """Serialize the results part of a simulation response and remember it in the result cache"""
+    payload = dumps({name: value for name, value in response.__dict__.items() if name not in _ENVELOPE_FIELDS})
+    result_cache.put(key, payload, runtime_ms=(time.perf_counter() - started) * 1000)
+    return payload
+
+
+def _wrap_payload(payload: bytes, created_at: datetime) -> bytes:
+    """
+    Wrap a results payload in a fresh envelope, so every response (cached or not,
+    including duplicates within a batch) gets its own simulation_id and timestamps
+    """
+    envelope = dumps({
+        "simulation_id": uuid.uuid4().hex,
+        "status": SimulationStatus.COMPLETED,
+        "created_at": created_at,
+        "completed_at": datetime.now()
+    })
+    # Splice the two JSON objects: {envelope..., payload...}
+    return envelope[:-1] + b"," + payload[1:]
+
+
+def _payload_response(payload: bytes, created_at: datetime) -> Response:
+    return Response(content=_wrap_payload(payload, created_at), media_type="application/json")
+
 # ============================================================================
 # Simulation Endpoints
 # ============================================================================
@@ -46,21 +98,18 @@ async def simulate_buying(input_data: BuyingScenarioInput):
     - Maintenance costs
     - Net equity over time
     """
+    created_at = datetime.now()
+    key = result_cache.key("buying", input_data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return _payload_response(cached, created_at)
+
     try:
-        # Run simulation
-        results = SimulationService.run_buying_scenario(input_data)
-
-        # Wrap in ResultsResponse
-        response = ResultsResponse(
-            simulation_id=str(uuid.uuid4()),
-            status=SimulationStatus.COMPLETED,
-            created_at=datetime.now(),
-            completed_at=datetime.now(),
-            buying_results=results,
-            simulation_params={"buying": input_data.model_dump()}
-        )
+        started = time.perf_counter()
 
-        return response
+        # Run simulation off the event loop so other requests keep being served
+        response = await asyncio.to_thread(SimulationService.buying_response, input_data)
+        return _payload_response(_cache_payload(key, response, started), created_at)
 
     except ValueError as e:
         raise HTTPException(
@@ -90,21 +139,18 @@ async def simulate_investment(input_data: InvestmentScenarioInput):
     - Total returns
     - Annualized performance
     """
+    created_at = datetime.now()
+    key = result_cache.key("investment", input_data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return _payload_response(cached, created_at)
+
     try:
-        # Run simulation
-        results = SimulationService.run_investment_scenario(input_data)
-
-        # Wrap in ResultsResponse
-        response = ResultsResponse(
-            simulation_id=str(uuid.uuid4()),
-            status=SimulationStatus.COMPLETED,
-            created_at=datetime.now(),
-            completed_at=datetime.now(),
-            investment_results=results,
-            simulation_params={"investment": input_data.model_dump()}
-        )
+        started = time.perf_counter()
 
-        return response
+        # Run simulation off the event loop so other requests keep being served
+        response = await asyncio.to_thread(SimulationService.investment_response, input_data)
+        return _payload_response(_cache_payload(key, response, started), created_at)
 
     except ValueError as e:
         raise HTTPException(
@@ -133,9 +179,16 @@ async def simulate_compare(input_data: ComparisonInput):
     - Buying vs Investment
     - Multiple configurations
     """
+    created_at = datetime.now()
+    key = result_cache.key("compare", input_data)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return _payload_response(cached, created_at)
+
     try:
-        results = SimulationService.run_comparison(input_data)
-        return results
+        started = time.perf_counter()
+        response = await SimulationService.run_comparison(input_data)
+        return _payload_response(_cache_payload(key, response, started), created_at)
 
     except ValueError as e:
         raise HTTPException(
@@ -149,6 +202,65 @@ async def simulate_compare(input_data: ComparisonInput):
         )
 
 
+@router.post(
+    "/simulate/batch",
+    response_model=List[ResultsResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Run a batch of scenarios",
+    description="Run several buying and/or investment scenarios in one round trip"
+)
+async def simulate_batch(input_data: BatchInput):
+    """
+    Run a list of independent scenarios concurrently.
+
+    Identical scenarios in the batch are simulated once, and scenarios already
+    in the result cache are not simulated at all. Results are returned in the
+    order the scenarios were submitted.
+    """
+    try:
+        created_at = datetime.now()
+        keys = []
+        payloads: Dict[str, bytes] = {}
+        pending: Dict[str, Any] = {}
+        for scenario in input_data.scenarios:
+            kind = "buying" if isinstance(scenario, BuyingScenarioInput) else "investment"
+            key = result_cache.key(kind, scenario)
+            keys.append(key)
+            if key in payloads or key in pending:
+                continue
+            cached = result_cache.get(key)
+            if cached is not None:
+                payloads[key] = cached
+            else:
+                pending[key] = scenario
+
+        async def _run(key: str, scenario) -> None:
+            started = time.perf_counter()
+            if isinstance(scenario, BuyingScenarioInput):
+                response = await asyncio.to_thread(SimulationService.buying_response, scenario)
+            else:
+                response = await asyncio.to_thread(SimulationService.investment_response, scenario)
+            payloads[key] = _cache_payload(key, response, started)
+
+        await asyncio.gather(*(_run(key, scenario) for key, scenario in pending.items()))
+
+        # Stitch the already-serialized payloads into one JSON array, each entry
+        # (even a duplicated scenario) in its own envelope
+        content = b"[" + b",".join(_wrap_payload(payloads[key], created_at) for key in keys) + b"]"
+        return Response(content=content, media_type="application/json")
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch simulation failed: {str(e)}"
+        )
+
+
 # ============================================================================
 # Parameters & Utilities
 # ============================================================================
@@ -159,13 +271,18 @@ async def simulate_compare(input_data: ComparisonInput):
     summary="Get default parameters",
     description="Retrieve default simulation parameters and recommended values"
 )
-async def get_default_parameters():
+async def get_default_parameters(request: Request):
     """
     Get default simulation parameters.
 
     Useful for populating forms with sensible defaults.
     """
-    return {
+    return _cached_json_response(request, *_defaults_blob())
+
+
+@lru_cache(maxsize=1)
+def _defaults_blob() -> Tuple[bytes, str]:
+    return _json_blob({
         "simulation_years": settings.DEFAULT_SIMULATION_YEARS,
         "n_simulations": settings.DEFAULT_N_SIMULATIONS,
         "stocks_tax_rate": settings.DEFAULT_STOCKS_TAX_RATE,
@@ -193,7 +310,7 @@ async def get_default_parameters():
             "max_years": 50,
             "min_years": 1
         }
-    }
+    })
 
 
 @router.post(
@@ -218,21 +335,14 @@ async def preview_mortgage(mortgage_params: Dict[str, Dict[str, Any]]):
 
         # Get first year of payments as sample
         sample_schedule = mortgage.amortization_schedule[:12]
+        sample_array = mortgage.amortization_array[:12]
+        total_payments = sample_array[:, 0]
 
         return {
             "total_loan_value": mortgage.total_loan_value,
-            "monthly_payment_first_year": [
-                int(entry["total_payment"].replace(",", ""))
-                for entry in sample_schedule
-            ],
-            "average_monthly_payment": sum(
-                int(entry["total_payment"].replace(",", ""))
-                for entry in sample_schedule
-            ) / len(sample_schedule),
-            "total_interest_year_1": sum(
-                int(entry["interest_payment"].replace(",", ""))
-                for entry in sample_schedule
-            ),
+            "monthly_payment_first_year": total_payments.tolist(),
+            "average_monthly_payment": float(total_payments.mean()),
+            "total_interest_year_1": int(sample_array[:, 1].sum()),
             "schedule_sample": sample_schedule
         }
 
@@ -252,9 +362,14 @@ async def preview_mortgage(mortgage_params: Dict[str, Dict[str, Any]]):
     summary="API information",
     description="Get API version and capabilities"
 )
-async def get_api_info():
+async def get_api_info(request: Request):
     """Get API information and capabilities"""
-    return {
+    return _cached_json_response(request, *_info_blob())
+
+
+@lru_cache(maxsize=1)
+def _info_blob() -> Tuple[bytes, str]:
+    return _json_blob({
         "name": "TBONTB API",
         "version": "1.0.0",
         "description": "Financial simulation API for comparing buying vs investing scenarios",
@@ -262,7 +377,8 @@ async def get_api_info():
             "simulations": [
                 "/api/v1/simulate/buying",
                 "/api/v1/simulate/investment",
-                "/api/v1/simulate/compare"
+                "/api/v1/simulate/compare",
+                "/api/v1/simulate/batch"
             ],
             "utilities": [
                 "/api/v1/parameters/defaults",
@@ -276,4 +392,4 @@ async def get_api_info():
             "Investment portfolio simulation",
             "Scenario comparison"
         ]
-    }
+    })
@@ -21,6 +21,11 @@ class Settings(BaseSettings):
     DEFAULT_SIMULATION_YEARS: int = 30
     DEFAULT_N_SIMULATIONS: int = 10000
     MAX_N_SIMULATIONS: int = 50000
+    SIMULATION_PROCESSES: int = 2  # Worker processes for comparison scenarios (0 runs them in threads)
+
+    # Result Cache Settings
+    RESULT_CACHE_SIZE: int = 128  # Number of serialized responses kept (0 disables the cache)
+    RESULT_CACHE_MIN_RUNTIME_MS: float = 50.0  # Only cache simulations that took at least this long
 
     # Tax Settings
     DEFAULT_STOCKS_TAX_RATE: float = 25.0
@@ -0,0 +1,32 @@
+"""
+JSON response helpers backed by orjson
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# NumPy arrays are serialized directly from their buffers, without .tolist()
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    # Pydantic models are written straight from their field values, skipping model_dump()
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any, sort_keys: bool = False) -> bytes:
+    """Serialize content (including NumPy arrays and pydantic models) to JSON bytes"""
+    option = ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else ORJSON_OPTIONS
+    return orjson.dumps(content, default=_default, option=option)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, able to serialize NumPy arrays"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
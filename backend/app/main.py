@@ -3,15 +3,28 @@ FastAPI application entry point for TBONTB (To Buy Or Not To Buy)
 Financial simulation API
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.api import routes
+from app.services.simulation import SimulationService, shutdown_process_pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the simulation kernels up front so the first request isn't slowed by JIT
+    SimulationService.warmup()
+    yield
+    shutdown_process_pool()
 
 app = FastAPI(
     title="TBONTB API",
     description="Financial simulation API for comparing buying vs investing scenarios",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend communication
@@ -23,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (simulation paths are hundreds of KB of numeric JSON)
+app.add_middleware(GZipMiddleware, minimum_size=4096, compresslevel=5)
+
 # Include API routes
 app.include_router(routes.router, prefix="/api/v1")
 
@@ -2,11 +2,19 @@
 Pydantic models for simulation results
 """
 
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from pydantic import BaseModel, Field, WithJsonSchema
+from typing import Annotated, Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
 
+# Simulation paths and monthly series are NumPy arrays passed through without
+# validation and serialized by orjson; the schema still documents them as number lists.
+PathMatrix = Annotated[
+    Any,
+    WithJsonSchema({"type": "array", "items": {"type": "array", "items": {"type": "number"}}})
+]
+SeriesVector = Annotated[Any, WithJsonSchema({"type": "array", "items": {"type": "number"}})]
+
 class SimulationStatus(str, Enum):
     """Simulation status states"""
     PENDING = "pending"
@@ -56,16 +64,16 @@ class BuyingScenarioResults(BaseModel):
     net_equity: Dict[str, float] = Field(..., description="Net equity statistics")
 
     # Monthly data for charts
-    monthly_mortgage_balance: List[float] = Field(..., description="Mortgage balance over time")
-    monthly_principal_paid: List[float] = Field(..., description="Principal paid each month")
-    monthly_interest_paid: List[float] = Field(..., description="Interest paid each month")
+    monthly_mortgage_balance: SeriesVector = Field(..., description="Mortgage balance over time")
+    monthly_principal_paid: SeriesVector = Field(..., description="Principal paid each month")
+    monthly_interest_paid: SeriesVector = Field(..., description="Interest paid each month")
 
     # Simulation paths (for visualization)
-    property_value_paths: List[List[float]] = Field(
+    property_value_paths: PathMatrix = Field(
         ...,
         description="Property value simulation paths (limited to sample for response size)"
     )
-    net_equity_paths: List[List[float]] = Field(
+    net_equity_paths: PathMatrix = Field(
         ...,
         description="Net equity simulation paths"
     )
@@ -79,11 +87,11 @@ class InvestmentScenarioResults(BaseModel):
     final_value_taxed: Dict[str, float] = Field(..., description="Taxed value statistics")
 
     # Simulation paths (for visualization)
-    investment_paths_untaxed: List[List[float]] = Field(
+    investment_paths_untaxed: PathMatrix = Field(
         ...,
         description="Investment value paths before tax"
     )
-    investment_paths_taxed: List[List[float]] = Field(
+    investment_paths_taxed: PathMatrix = Field(
         ...,
         description="Investment value paths after tax"
     )
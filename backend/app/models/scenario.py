@@ -3,7 +3,7 @@ Pydantic models for scenario inputs
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime
 
 class ForecastParams(BaseModel):
@@ -111,3 +111,12 @@ class ComparisonInput(BaseModel):
         if not v and not info.data.get('buying_scenario'):
             raise ValueError("At least one scenario must be provided")
         return v
+
+class BatchInput(BaseModel):
+    """Input for running several independent scenarios in one request"""
+    scenarios: List[Union[BuyingScenarioInput, InvestmentScenarioInput]] = Field(
+        ...,
+        description="Buying and/or investment scenarios, returned in the same order",
+        min_length=1,
+        max_length=50
+    )
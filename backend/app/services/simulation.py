@@ -2,10 +2,17 @@
 Simulation service layer - wraps existing simulation code
 """
 
+import asyncio
+import hashlib
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 from pathlib import Path
 import numpy as np
-from typing import Dict, Any
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
 import uuid
 from datetime import datetime
 
@@ -13,13 +20,15 @@ from datetime import datetime
 backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from functions import simulate_investment, simulate_buying_scenario, simulate_property_value
+from functions import simulate_investment, simulate_buying_paths, warmup_kernels
 from mortgage_calc import mortgage_factory
 from app.models.scenario import (
     BuyingScenarioInput,
     InvestmentScenarioInput,
     ComparisonInput
 )
+from app.core.config import settings
+from app.core.responses import dumps
 from app.models.results import (
     BuyingScenarioResults,
     InvestmentScenarioResults,
@@ -29,31 +38,101 @@ from app.models.results import (
     ResultsResponse
 )
 
+class ResultCache:
+    """
+    LRU cache of serialized simulation results, keyed by a hash of the
+    canonical JSON of the request input. Only the results payload is stored;
+    the routes wrap it in a fresh envelope (simulation_id, timestamps) per response.
+
+    Only simulations that took at least `min_runtime_ms` are stored, so cheap
+    runs don't evict expensive ones.
+    """
+
+    def __init__(self, maxsize: int, min_runtime_ms: float):
+        self.maxsize = maxsize
+        self.min_runtime_ms = min_runtime_ms
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    @staticmethod
+    def key(kind: str, input_data: BaseModel) -> str:
+        """Content hash of an input model, namespaced by the simulation kind"""
+        canonical = dumps(input_data, sort_keys=True)
+        return hashlib.blake2b(kind.encode() + b":" + canonical, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: str, body: bytes, runtime_ms: float) -> None:
+        if self.maxsize <= 0 or runtime_ms < self.min_runtime_ms:
+            return
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def input_seed(input_data: BaseModel) -> int:
+    """Seed derived from the input's content, so identical inputs give identical simulations"""
+    canonical = dumps(input_data, sort_keys=True)
+    return int.from_bytes(hashlib.blake2b(canonical, digest_size=8).digest(), "little")
+
+
+result_cache = ResultCache(
+    maxsize=settings.RESULT_CACHE_SIZE,
+    min_runtime_ms=settings.RESULT_CACHE_MIN_RUNTIME_MS
+)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Worker processes for running comparison scenarios in parallel, started on first use"""
+    global _process_pool
+    if _process_pool is None and settings.SIMULATION_PROCESSES > 0:
+        # spawn rather than fork: the parent already runs Numba's OpenMP thread pool
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.SIMULATION_PROCESSES,
+            mp_context=get_context("spawn"),
+            initializer=warmup_kernels
+        )
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
 class SimulationService:
     """Service for running financial simulations"""
 
+    # Number of full paths returned for visualization; the simulators keep
+    # only this many monthly paths and final values for the rest.
+    SAMPLE_PATHS = 100
+
+    @staticmethod
+    def warmup() -> None:
+        """Run tiny simulations so the Numba kernels are compiled before the first request"""
+        warmup_kernels()
+
     @staticmethod
     def _calculate_percentiles(data: np.ndarray) -> Dict[str, float]:
-        """Calculate key percentiles from simulation data"""
+        """Calculate key percentiles from simulation data (float32 or float64)"""
+        p10, median, p90 = np.quantile(data, [0.1, 0.5, 0.9])
         return {
-            "median": float(np.percentile(data, 50)),
-            "p10": float(np.percentile(data, 10)),
-            "p90": float(np.percentile(data, 90)),
+            "median": float(median),
+            "p10": float(p10),
+            "p90": float(p90),
             "mean": float(np.mean(data)),
             "std": float(np.std(data))
         }
 
-    @staticmethod
-    def _sample_paths(paths: np.ndarray, max_paths: int = 100) -> list:
-        """Sample simulation paths to reduce response size"""
-        n_paths = paths.shape[1] if len(paths.shape) > 1 else 1
-        if n_paths <= max_paths:
-            return paths.tolist()
-
-        # Randomly sample paths
-        indices = np.random.choice(n_paths, max_paths, replace=False)
-        return paths[:, indices].tolist()
-
     @staticmethod
     def run_buying_scenario(input_data: BuyingScenarioInput) -> BuyingScenarioResults:
         """
@@ -65,14 +144,8 @@ class SimulationService:
         Returns:
             BuyingScenarioResults with simulation outcomes
         """
-        # Convert Pydantic models to dict for existing code
-        mortgage_params = {
-            name: params.model_dump()
-            for name, params in input_data.mortgage_params.items()
-        }
-
-        # Create mortgage object
-        mortgage = mortgage_factory(mortgage_params)
+        # Create mortgage object straight from the validated track models
+        mortgage = mortgage_factory(input_data.mortgage_params)
 
         # Validate financing
         total_loan = mortgage.total_loan_value
@@ -82,21 +155,17 @@ class SimulationService:
                 f"({input_data.down_payment}) != apartment_price ({input_data.apartment_price})"
             )
 
-        # Simulate property value
-        property_value_paths = simulate_property_value(
+        # Simulate property value, maintenance and net equity in one fused pass
+        buying_results = simulate_buying_paths(
             apartment_price=input_data.apartment_price,
             years=input_data.simulation_years,
-            forecast_params=input_data.forecast_params.model_dump(),
-            n_sim=input_data.n_sim
-        )
-
-        # Run buying simulation
-        buying_results = simulate_buying_scenario(
-            property_value_paths=property_value_paths,
+            forecast_params={'mu': input_data.forecast_params.mu, 'sigma': input_data.forecast_params.sigma},
             mortgage=mortgage,
-            years=input_data.simulation_years,
             maintenance_cost_rate=input_data.maintenance_cost_rate,
-            fixed_maintenance_cost=input_data.fixed_maintenance_cost
+            fixed_maintenance_cost=input_data.fixed_maintenance_cost,
+            n_sim=input_data.n_sim,
+            sample_size=SimulationService.SAMPLE_PATHS,
+            rng=input_seed(input_data)
         )
 
         # Calculate summary statistics
@@ -104,31 +173,32 @@ class SimulationService:
         final_property_values = buying_results['final_property_value']
         maintenance_costs = buying_results['total_maintenance_cost']
 
-        summary = ScenarioSummary(
+        net_equity = SimulationService._calculate_percentiles(final_values)
+        summary = ScenarioSummary.model_construct(
             scenario_type="buying",
-            final_value_median=float(np.percentile(final_values, 50)),
-            final_value_pessimistic=float(np.percentile(final_values, 10)),
-            final_value_optimistic=float(np.percentile(final_values, 90)),
+            final_value_median=net_equity["median"],
+            final_value_pessimistic=net_equity["p10"],
+            final_value_optimistic=net_equity["p90"],
             total_invested=input_data.apartment_price,
-            total_return=float(np.percentile(final_values, 50)) - input_data.apartment_price,
+            total_return=net_equity["median"] - input_data.apartment_price,
             annualized_return=(
-                (float(np.percentile(final_values, 50)) / input_data.apartment_price) **
+                (net_equity["median"] / input_data.apartment_price) **
                 (1 / input_data.simulation_years) - 1
             ) * 100
         )
 
         # Prepare results
-        results = BuyingScenarioResults(
+        results = BuyingScenarioResults.model_construct(
             summary=summary,
             final_property_value=SimulationService._calculate_percentiles(final_property_values),
             remaining_mortgage=float(buying_results['remaining_mortgage']),
             total_maintenance_cost=SimulationService._calculate_percentiles(maintenance_costs),
-            net_equity=SimulationService._calculate_percentiles(final_values),
-            monthly_mortgage_balance=buying_results['monthly_mortgage_balance'].tolist(),
-            monthly_principal_paid=buying_results['monthly_principal_paid'].tolist(),
-            monthly_interest_paid=buying_results['monthly_interest_paid'].tolist(),
-            property_value_paths=SimulationService._sample_paths(property_value_paths),
-            net_equity_paths=SimulationService._sample_paths(buying_results['monthly_net_equity'])
+            net_equity=net_equity,
+            monthly_mortgage_balance=buying_results['monthly_mortgage_balance'],
+            monthly_principal_paid=buying_results['monthly_principal_paid'],
+            monthly_interest_paid=buying_results['monthly_interest_paid'],
+            property_value_paths=buying_results['property_value_paths'],
+            net_equity_paths=buying_results['monthly_net_equity']
         )
 
         return results
@@ -144,6 +214,9 @@ class SimulationService:
         Returns:
             InvestmentScenarioResults with simulation outcomes
         """
+        # Convert the years x 12 contribution schedule once; the simulator uses it as is
+        contributions = np.asarray(input_data.profile.monthly_free_income, dtype=np.float64)
+
         # Run investment simulation
         investment_results = simulate_investment(
             initial_fortune=input_data.profile.savings,
@@ -153,80 +226,143 @@ class SimulationService:
             percentace_management_fee=input_data.percentage_management_fee,
             ILS_management_fee=input_data.ILS_management_fee,
             initial_already_invested=input_data.initial_already_invested,
-            contributions_schedule=input_data.profile.monthly_free_income,
-            forecast_params=input_data.forecast_params.model_dump(),
-            n_sim=input_data.n_sim
+            contributions_schedule=contributions,
+            forecast_params={'mu': input_data.forecast_params.mu, 'sigma': input_data.forecast_params.sigma},
+            n_sim=input_data.n_sim,
+            sample_size=SimulationService.SAMPLE_PATHS,
+            rng=input_seed(input_data)
         )
 
-        # Extract final values
+        # Extract sampled paths and final values
         paths_untaxed = investment_results['final_investment_paths_untaxed']
         paths_taxed = investment_results['final_investment_paths_taxed']
 
-        final_untaxed = paths_untaxed[-1, :]
-        final_taxed = paths_taxed[-1, :]
+        final_untaxed = investment_results['final_value_untaxed']
+        final_taxed = investment_results['final_value_taxed']
 
         # Calculate total invested
-        total_invested = input_data.profile.savings + sum(
-            sum(year) for year in input_data.profile.monthly_free_income
-        )
+        total_invested = float(input_data.profile.savings + contributions.sum())
 
-        summary = ScenarioSummary(
+        final_value_taxed = SimulationService._calculate_percentiles(final_taxed)
+        summary = ScenarioSummary.model_construct(
             scenario_type="investment",
-            final_value_median=float(np.percentile(final_taxed, 50)),
-            final_value_pessimistic=float(np.percentile(final_taxed, 10)),
-            final_value_optimistic=float(np.percentile(final_taxed, 90)),
+            final_value_median=final_value_taxed["median"],
+            final_value_pessimistic=final_value_taxed["p10"],
+            final_value_optimistic=final_value_taxed["p90"],
             total_invested=total_invested,
-            total_return=float(np.percentile(final_taxed, 50)) - total_invested,
+            total_return=final_value_taxed["median"] - total_invested,
             annualized_return=(
-                (float(np.percentile(final_taxed, 50)) / total_invested) **
+                (final_value_taxed["median"] / total_invested) **
                 (1 / input_data.simulation_years) - 1
             ) * 100
         )
 
-        results = InvestmentScenarioResults(
+        results = InvestmentScenarioResults.model_construct(
             summary=summary,
             final_value_untaxed=SimulationService._calculate_percentiles(final_untaxed),
-            final_value_taxed=SimulationService._calculate_percentiles(final_taxed),
-            investment_paths_untaxed=SimulationService._sample_paths(paths_untaxed),
-            investment_paths_taxed=SimulationService._sample_paths(paths_taxed)
+            final_value_taxed=final_value_taxed,
+            investment_paths_untaxed=paths_untaxed,
+            investment_paths_taxed=paths_taxed
         )
 
         return results
 
     @staticmethod
-    def run_comparison(input_data: ComparisonInput) -> ResultsResponse:
+    def _results_response(created_at: datetime, simulation_params: Dict[str, Any], **results) -> ResultsResponse:
+        """
+        Wrap finished scenario results in the ResultsResponse envelope
+
+        Inputs were validated at the HTTP boundary and results are built here from
+        trusted values, so the models are constructed without revalidation.
+        """
+        return ResultsResponse.model_construct(
+            simulation_id=uuid.uuid4().hex,
+            status=SimulationStatus.COMPLETED,
+            created_at=created_at,
+            completed_at=datetime.now(),
+            simulation_params=simulation_params,
+            **results
+        )
+
+    @staticmethod
+    def buying_response(input_data: BuyingScenarioInput) -> ResultsResponse:
+        """Run a buying scenario and return it as a complete ResultsResponse"""
+        created_at = datetime.now()
+        return SimulationService._results_response(
+            created_at,
+            {"buying": input_data},
+            buying_results=SimulationService.run_buying_scenario(input_data)
+        )
+
+    @staticmethod
+    def investment_response(input_data: InvestmentScenarioInput) -> ResultsResponse:
+        """Run an investment scenario and return it as a complete ResultsResponse"""
+        created_at = datetime.now()
+        return SimulationService._results_response(
+            created_at,
+            {"investment": input_data},
+            investment_results=SimulationService.run_investment_scenario(input_data)
+        )
+
+    @staticmethod
+    async def _run_comparison_scenarios(input_data: ComparisonInput):
+        """Run the comparison's scenarios concurrently on the process pool (or threads)"""
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+
+        def _none():
+            # An already-finished future rather than a coroutine, so nothing is left
+            # unawaited if submitting to a broken pool raises before the gather
+            future = loop.create_future()
+            future.set_result(None)
+            return future
+
+        buying_task = (
+            loop.run_in_executor(pool, SimulationService.run_buying_scenario, input_data.buying_scenario)
+            if input_data.buying_scenario else _none()
+        )
+        investment_task = (
+            loop.run_in_executor(pool, SimulationService.run_investment_scenario, input_data.investment_scenario)
+            if input_data.investment_scenario else _none()
+        )
+
+        return await asyncio.gather(buying_task, investment_task)
+
+    @staticmethod
+    async def run_comparison(input_data: ComparisonInput) -> ResultsResponse:
         """
         Run comparison of multiple scenarios
 
+        The scenarios are independent, so they run concurrently in separate
+        worker processes (or threads when SIMULATION_PROCESSES is 0).
+
         Args:
             input_data: Comparison input with multiple scenarios
 
         Returns:
             ResultsResponse with all scenario results
         """
-        simulation_id = str(uuid.uuid4())
         created_at = datetime.now()
 
-        buying_results = None
-        investment_results = None
-
-        if input_data.buying_scenario:
-            buying_results = SimulationService.run_buying_scenario(input_data.buying_scenario)
-
-        if input_data.investment_scenario:
-            investment_results = SimulationService.run_investment_scenario(input_data.investment_scenario)
-
-        response = ResultsResponse(
-            simulation_id=simulation_id,
-            status=SimulationStatus.COMPLETED,
-            created_at=created_at,
-            completed_at=datetime.now(),
+        try:
+            buying_results, investment_results = await SimulationService._run_comparison_scenarios(input_data)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed), which leaves the executor unusable.
+            # Replace the pool and retry once; if it breaks again, still drop the
+            # broken pool so later requests start from a fresh one.
+            shutdown_process_pool()
+            try:
+                buying_results, investment_results = await SimulationService._run_comparison_scenarios(input_data)
+            except BrokenProcessPool:
+                shutdown_process_pool()
+                raise
+
+        return SimulationService._results_response(
+            created_at,
+            {
+                "buying": input_data.buying_scenario,
+                "investment": input_data.investment_scenario
+            },
             buying_results=buying_results,
-            investment_results=investment_results,
-            simulation_params={
-                "buying": input_data.buying_scenario.model_dump() if input_data.buying_scenario else None,
-                "investment": input_data.investment_scenario.model_dump() if input_data.investment_scenario else None
-            }
+            investment_results=investment_results
         )
-
-        return response
@@ -6,6 +6,10 @@ import numpy as np
 import humanize
 from abc import ABC, abstractmethod
 
+# Column order of the numeric amortization_array kept next to each amortization_schedule
+AMORTIZATION_COLUMNS = ("total_payment", "interest_payment", "principal_payment", "remaining_balance")
+
+
 class BaseMortgage(ABC):
     """Base class for all mortgage types."""
     @abstractmethod
@@ -15,6 +19,7 @@ class BaseMortgage(ABC):
         self.term_years = term_years             # Loan term in years
         self.term_months = term_years * 12
         self.amortization_schedule = None
+        self.amortization_array = None
 
     def _calc_monthly_payment(self, interest_rate, principal, term_months):
         '''
@@ -51,6 +56,7 @@ class BaseMortgage(ABC):
         first pay according to current balance, then calc remaining principal
         """
         schedule = []
+        rows = []
         current_balance = self.principal
 
         for period in range(1, self.term_months + 1):
@@ -73,9 +79,11 @@ class BaseMortgage(ABC):
                 "remaining_balance": humanize.intcomma(int(new_balance)),
                 "current_interest_rate": humanize.intcomma(int(period_interest_rate)),
             })
+            rows.append((int(monthly_payment), int(interest_payment), int(principal_payment), int(new_balance)))
             current_balance = new_balance
 
         self.amortization_schedule = schedule
+        self.amortization_array = np.array(rows, dtype=np.int64).reshape(-1, len(AMORTIZATION_COLUMNS))
         return schedule
 
     @abstractmethod
@@ -262,6 +270,13 @@ class MultiTrackMortgage:
             total_schedule.append(entry)
 
         self.amortization_schedule = total_schedule
+
+        # Numeric counterpart: sum the track arrays period by period (shorter tracks count as zero).
+        n_periods = max((len(track.amortization_array) for track in self.mortgage_tracks.values()), default=0)
+        total_array = np.zeros((n_periods, len(AMORTIZATION_COLUMNS)), dtype=np.int64)
+        for track in self.mortgage_tracks.values():
+            total_array[:len(track.amortization_array)] += track.amortization_array
+        self.amortization_array = total_array
         return total_schedule
 
     def get_track_schedule(self, track_name):
@@ -317,6 +332,9 @@ def mortgage_factory(mortgage_params):
 
     mortgage_tracks = {}
     for name, params in mortgage_params.items():
+        if not isinstance(params, dict):
+            # Attribute-style track parameters (e.g. pydantic models) are read from their fields
+            params = vars(params)
         m_type = params.get("type", "").lower()
         mortgage_class = MORTGAGE_TYPES.get(m_type)
         if not mortgage_class:
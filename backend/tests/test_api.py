@@ -0,0 +1,141 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numba
+
+BACKEND_DIR = str(Path(__file__).resolve().parents[1])
+
+# The backend ships its own copies of these modules, which the root test suite
+# imports under the same names (and Numba re-imports them by name at run time).
+# Swap the backend copies in only while this module's tests run, so both suites
+# can share one pytest session.
+_SHARED_MODULES = ("functions", "forecasting", "mortgage_calc")
+
+
+def _swap_modules(modules, add_path):
+    """Install `modules` under the shared names and return the ones they replace"""
+    replaced = {name: sys.modules.pop(name) for name in _SHARED_MODULES if name in sys.modules}
+    sys.modules.update(modules)
+    while BACKEND_DIR in sys.path:
+        sys.path.remove(BACKEND_DIR)
+    if add_path:
+        sys.path.insert(0, BACKEND_DIR)
+    return replaced
+
+
+_other_modules = _swap_modules({}, add_path=True)
+# The routes run simulations in worker threads; use OpenMP as the deployment does
+# (this only takes effect if no Numba kernel has run in this process yet)
+numba.config.THREADING_LAYER = "omp"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.simulation import result_cache  # noqa: E402
+
+_backend_modules = _swap_modules(_other_modules, add_path=False)
+
+
+def setUpModule():
+    global _other_modules
+    _other_modules = _swap_modules(_backend_modules, add_path=True)
+
+
+def tearDownModule():
+    _swap_modules(_other_modules, add_path=False)
+
+
+ENVELOPE_FIELDS = ("simulation_id", "status", "created_at", "completed_at")
+
+
+def investment_input(savings=1000):
+    return {
+        "profile": {"monthly_free_income": [[1000.0] * 12] * 2, "savings": savings},
+        "tax_rate": 25,
+        "simulation_years": 2,
+        "n_sim": 200,
+        "forecast_params": {"mu": 0.05, "sigma": 0.15}
+    }
+
+
+def without_envelope(response):
+    return {key: value for key, value in response.items() if key not in ENVELOPE_FIELDS}
+
+
+class TestSimulationRoutes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # No lifespan (warmup/process pool) needed for these routes
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        # Cache every result regardless of runtime, starting from an empty cache
+        self._min_runtime_ms = result_cache.min_runtime_ms
+        result_cache.min_runtime_ms = 0
+        result_cache._entries.clear()
+
+    def tearDown(self):
+        result_cache.min_runtime_ms = self._min_runtime_ms
+        result_cache._entries.clear()
+
+    def test_same_input_same_payload_distinct_id(self):
+        first = self.client.post("/api/v1/simulate/investment", json=investment_input())
+        second = self.client.post("/api/v1/simulate/investment", json=investment_input())  # cache hit
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertEqual(second.status_code, 200)
+        first, second = first.json(), second.json()
+        self.assertEqual(list(first)[:len(ENVELOPE_FIELDS)], list(ENVELOPE_FIELDS))
+        self.assertNotEqual(first["simulation_id"], second["simulation_id"])
+        self.assertEqual(without_envelope(first), without_envelope(second))
+
+    def test_seed_is_derived_from_input(self):
+        # Without the cache, an identical input still reproduces the same simulation
+        first = self.client.post("/api/v1/simulate/investment", json=investment_input()).json()
+        result_cache._entries.clear()
+        second = self.client.post("/api/v1/simulate/investment", json=investment_input()).json()
+        self.assertEqual(without_envelope(first), without_envelope(second))
+        other = self.client.post("/api/v1/simulate/investment", json=investment_input(savings=2000)).json()
+        self.assertNotEqual(first["investment_results"], other["investment_results"])
+
+    def test_batch_returns_one_result_per_scenario(self):
+        scenarios = [investment_input(1000), investment_input(2000), investment_input(1000)]
+        response = self.client.post("/api/v1/simulate/batch", json={"scenarios": scenarios})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual(len(results), len(scenarios))
+        # Results follow the submission order, and duplicates still get their own id
+        invested = [result["investment_results"]["summary"]["total_invested"] for result in results]
+        self.assertEqual(invested, [1000 + 24000, 2000 + 24000, 1000 + 24000])
+        self.assertEqual(len({result["simulation_id"] for result in results}), len(scenarios))
+        self.assertEqual(without_envelope(results[0]), without_envelope(results[2]))
+
+    def test_short_contribution_schedule_is_rejected(self):
+        data = investment_input()
+        data["simulation_years"] = 30
+        response = self.client.post("/api/v1/simulate/investment", json=data)
+        self.assertEqual(response.status_code, 400)
+
+
+class TestStaticRoutes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_if_none_match_returns_304(self):
+        for path in ("/api/v1/parameters/defaults", "/api/v1/info"):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers["etag"]
+                cached = self.client.get(path, headers={"If-None-Match": etag})
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.headers["etag"], etag)
+                self.assertEqual(cached.content, b"")
+                stale = self.client.get(path, headers={"If-None-Match": '"stale"'})
+                self.assertEqual(stale.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
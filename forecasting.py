@@ -1,10 +1,18 @@
+import math
 import numpy as np
 import plotly.graph_objects as go
-import humanize
 import openpyxl
 import matplotlib.pyplot as plt
 import yfinance as yf
 import pandas as pd
+from numba import njit, prange
+from scipy.special import ndtr, ndtri
+from scipy.stats import qmc
+
+try:
+    import cupy as cp  # optional, only needed for gbm_quantiles_gpu
+except ImportError:
+    cp = None
 
 '''
 important: this file is not directly used be the main file. it is for tests and trials in the forecasting field.
@@ -24,7 +32,57 @@ https://www.investopedia.com/articles/07/montecarlo.asp#:~:text=One%20of%20the%2
 '''
 
 
-def simulate_gbm(S0, mu, sigma, T, dt, n_simulations):
+@njit(parallel=True, fastmath=True, cache=True)
+def _gbm_antithetic_from_normals(S0, mu, sigma, dt, z, out):
+    """
+    GBM paths where column j and column half + j are driven by mirrored draws
+    (z[j] and -z[j]), so each pair of paths costs one row of normals. With an odd
+    number of simulations the last column is an ordinary path using the last row.
+    """
+    drift = (mu - 0.5 * sigma * sigma) * dt
+    vol = sigma * math.sqrt(dt)
+    half = out.shape[1] // 2
+    for j in prange(half):
+        s = S0
+        s_anti = S0
+        out[0, j] = s
+        out[0, half + j] = s_anti
+        for i in range(1, out.shape[0]):
+            shock = vol * z[j, i - 1]
+            s *= math.exp(drift + shock)
+            s_anti *= math.exp(drift - shock)
+            out[i, j] = s
+            out[i, half + j] = s_anti
+    if out.shape[1] % 2:
+        s = S0
+        out[0, -1] = s
+        for i in range(1, out.shape[0]):
+            s *= math.exp(drift + vol * z[half, i - 1])
+            out[i, -1] = s
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gbm_from_normals(S0, mu, sigma, dt, z, out):
+    """
+    GBM paths from pre-drawn normals z (shape: n_sim x (n_steps - 1), one row per
+    path). Each simulation walks its own column in a prange worker, keeping the
+    running value in a float64 register and only rounding to the output dtype
+    when it is stored.
+    """
+    drift = (mu - 0.5 * sigma * sigma) * dt
+    vol = sigma * math.sqrt(dt)
+    for j in prange(out.shape[1]):
+        s = S0
+        out[0, j] = s
+        for i in range(1, out.shape[0]):
+            s *= math.exp(drift + vol * z[j, i - 1])
+            out[i, j] = s
+
+
+GBM_METHODS = ('pseudo', 'antithetic', 'moment_matched', 'sobol')
+
+
+def simulate_gbm(S0, mu, sigma, T, dt, n_simulations, seed=None, method='pseudo'):
     """
     Simulate GBM paths.
 
@@ -35,18 +93,45 @@ def simulate_gbm(S0, mu, sigma, T, dt, n_simulations):
         T (float): Time horizon in years.
         dt (float): Time step in years (e.g. 1/252 for daily steps).
         n_simulations (int): Number of simulation paths.
+        seed (int or np.random.Generator, optional): Makes the paths reproducible. Passing one
+            Generator to successive calls continues its stream instead of reusing draws.
+        method (str): How the normal draws are generated:
+            'pseudo' - independent PCG64 draws, all taken in one batched call.
+            'antithetic' - paths come in mirrored pairs (z, -z); the mean error cancels
+                to first order, so fewer paths are needed for the same accuracy.
+            'moment_matched' - pseudo draws rescaled so that every time step's draws have
+                exactly zero mean and unit variance, removing the sampling error of the
+                first two moments at no extra cost. With a single path the raw draws are used.
+            'sobol' - scrambled Sobol quasi-random points mapped through the inverse
+                normal CDF, one dimension per time step; best with a power-of-two n_simulations.
 
     Returns:
-        t (np.array): Array of time points.
-        paths (np.array): Simulated paths (shape: n_steps x n_simulations).
+        paths (np.array): Simulated float32 paths (shape: n_steps x n_simulations). Monte Carlo
+            error dwarfs float32 rounding, and the halved footprint also speeds up plot_forecast,
+            whose quantiles and histogram read the whole matrix.
     """
     n_steps = int(T / dt) + 1
-    paths = np.zeros((n_steps, n_simulations))
-    paths[0] = S0
-    # Iterate over time steps
-    for i in range(1, n_steps):
-        z = np.random.standard_normal(n_simulations)  # random draws ~ N(0,1)
-        paths[i] = paths[i - 1] * np.exp((mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z)
+    paths = np.empty((n_steps, n_simulations), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    if method == 'pseudo':
+        z = rng.standard_normal((n_simulations, n_steps - 1), dtype=np.float32)
+        _gbm_from_normals(float(S0), float(mu), float(sigma), float(dt), z, paths)
+    elif method == 'antithetic':
+        z = rng.standard_normal((n_simulations - n_simulations // 2, n_steps - 1), dtype=np.float32)
+        _gbm_antithetic_from_normals(float(S0), float(mu), float(sigma), float(dt), z, paths)
+    elif method == 'moment_matched':
+        z = rng.standard_normal((n_simulations, n_steps - 1), dtype=np.float32)
+        # A single path has no sample moments to match, so it keeps the raw draws
+        if n_simulations > 1:
+            z -= z.mean(axis=0)
+            std = z.std(axis=0)
+            np.divide(z, std, out=z, where=std > 0)
+        _gbm_from_normals(float(S0), float(mu), float(sigma), float(dt), z, paths)
+    elif method == 'sobol':
+        u = qmc.Sobol(d=n_steps - 1, scramble=True, seed=rng).random(n_simulations)
+        _gbm_from_normals(float(S0), float(mu), float(sigma), float(dt), ndtri(u, out=u), paths)
+    else:
+        raise ValueError(f"method must be one of {GBM_METHODS}, got {method!r}")
     return paths
 
 def plot_forecast(paths, years, res=12, bins=1000, return_traces=False):
@@ -62,38 +147,182 @@ def plot_forecast(paths, years, res=12, bins=1000, return_traces=False):
     """
     t = np.linspace(0, years, int(years * res) + 1)
     n_simulations = paths.shape[1]
-    # Calculate the 10th, 90th percentiles, and mean for each time step
-    q10 = np.percentile(paths, 10, axis=1)
-    q90 = np.percentile(paths, 90, axis=1)
-    mean_line = np.percentile(paths, 50, axis=1)
+    # Calculate the 10th, 90th percentiles, and mean for each time step (one shared sort)
+    q10, mean_line, q90 = np.quantile(paths, [0.1, 0.5, 0.9], axis=1)
 
     # Determine bins for S values across all paths
     S_min = np.min(paths)
     S_max = np.max(paths)
-    bin_edges = np.linspace(S_min, S_max, bins + 1)
-    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-    formatted_bin_centers = [humanize.intcomma(int(val)) for val in bin_centers]
-    custom_heatmap = np.tile(formatted_bin_centers, (len(t) - 1, 1)).T
-    custom_q10 = [humanize.intcomma(int(val)) for val in q10]
-    custom_q90 = [humanize.intcomma(int(val)) for val in q90]
-    custom_mean = [humanize.intcomma(int(val)) for val in mean_line]
+    bin_width = (S_max - S_min) / bins
+    bin_centers = S_min + (np.arange(bins) + 0.5) * bin_width
 
     # Create a percentage density matrix for time intervals (one fewer than len(t))
-    density = np.zeros((bins, len(t) - 1))
-    for i in range(len(t) - 1):
-        counts, _ = np.histogram(paths[i, :], bins=bin_edges, density=False)
-        cum_counts = np.cumsum(counts)  # cumulative counts over the bins
-        density[:, i] = (cum_counts / n_simulations) * 100  # convert to percentage
+    # The bins are uniform, so each value's bin is plain arithmetic (last bin closed,
+    # as in np.histogram); then count all time steps with one bincount over
+    # (time step, bin) pairs.
+    n_intervals = len(t) - 1
+    inv_width = 1 / bin_width if bin_width > 0 else 0.0
+    idx = ((paths[:n_intervals] - S_min) * inv_width).astype(np.intp)
+    np.clip(idx, 0, bins - 1, out=idx)
+    idx += np.arange(n_intervals)[:, None] * bins
+    counts = np.bincount(idx.ravel(), minlength=n_intervals * bins).reshape(n_intervals, bins)
+    cum_counts = np.cumsum(counts, axis=1)  # cumulative counts over the bins
+    density = (cum_counts.T / n_simulations) * 100  # convert to percentage
+
+    return _forecast_figure(t, q10, mean_line, q90, bin_centers, density, return_traces)
+
+
+def plot_forecast_analytical(S0, mu, sigma, years, res=12, bins=1000, z_max=4.0, return_traces=False):
+    """
+    Same plot as plot_forecast without any Monte Carlo: GBM values are lognormal,
+    so P(S_t <= b) = Phi((ln(b / S0) - (mu - sigma^2 / 2) t) / (sigma sqrt(t))) and
+    the percentile lines are S0 * exp((mu - sigma^2 / 2) t + sigma sqrt(t) * Phi^-1(q)).
+
+    The value axis spans +-z_max standard deviations of the final log value.
+    """
+    t = np.linspace(0, years, int(years * res) + 1)
+    drift = (mu - 0.5 * sigma ** 2) * t
+    vol = sigma * np.sqrt(t)
+    q10, q50, q90 = S0 * np.exp(drift + vol * ndtri(np.array([0.1, 0.5, 0.9]))[:, None])
+
+    bin_edges = np.linspace(S0 * np.exp(drift[-1] - z_max * vol[-1]),
+                            S0 * np.exp(drift[-1] + z_max * vol[-1]), bins + 1)
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+
+    # Cumulative percentage at each bin's upper edge, per time interval; at t = 0
+    # every path sits at S0, so the CDF there is a step.
+    density = np.empty((bins, len(t) - 1))
+    density[:, 0] = bin_edges[1:] >= S0
+    log_edges = np.log(bin_edges[1:] / S0)[:, None]
+    density[:, 1:] = ndtr((log_edges - drift[1:-1]) / vol[1:-1])
+    density *= 100
+
+    return _forecast_figure(t, q10, q50, q90, bin_centers, density, return_traces)
+
+
+def gbm_quantiles_gpu(S0, mu, sigma, T, dt, n_simulations, quantiles=(0.1, 0.5, 0.9), seed=None):
+    """
+    Per-time-step quantiles of GBM paths computed on a CUDA GPU with CuPy.
+
+    The paths are built as in the cumulative-sum form (draw, scale, cumsum, exp)
+    entirely in device memory; only the (len(quantiles), n_steps) result is copied
+    back. The whole float32 path matrix has to fit on the GPU, so very long daily
+    horizons need fewer simulations per call.
+
+    Returns:
+        np.array of shape (len(quantiles), n_steps), the first column being S0.
+    """
+    if cp is None:
+        raise ImportError("gbm_quantiles_gpu requires CuPy (pip install cupy-cuda12x)")
+    n_steps = int(T / dt) + 1
+    rng = cp.random.default_rng(seed)
+    z = rng.standard_normal((n_steps - 1, n_simulations), dtype=cp.float32)
+    z *= sigma * math.sqrt(dt)
+    z += (mu - 0.5 * sigma ** 2) * dt
+    cp.cumsum(z, axis=0, out=z)
+    cp.exp(z, out=z)
+    z *= S0
+    q = cp.quantile(z, cp.asarray(quantiles, dtype=cp.float64), axis=1).get()
+    return np.concatenate((np.full((len(quantiles), 1), S0, dtype=q.dtype), q), axis=1)
+
+
+def summarize_gbm(S0, mu, sigma, T, dt, n_simulations, seed=None, method='pseudo',
+                  batch_size=20000, z_bins=2000, z_max=6.0):
+    """
+    Streams GBM paths through per-time-step histograms instead of keeping the
+    whole (n_steps, n_simulations) matrix, so memory is O(n_steps * z_bins)
+    whatever the number of simulations.
+
+    Paths are simulated batch_size at a time. Each value is binned on a fixed grid
+    of its standardized log value z = (ln(S_t / S0) - (mu - sigma^2 / 2) t) / (sigma sqrt(t)),
+    which gives every time step the same relative resolution. Values beyond
+    +-z_max land in the edge bins.
+
+    Returns:
+        dict with 't', 'q10', 'q50', 'q90' (per time step), 's_min'/'s_max' (extremes
+        over all paths) and 'cdf' - a function (values, step) -> fraction of paths at or
+        below each value at that time step.
+    """
+    n_steps = int(T / dt) + 1
+    t = np.arange(n_steps) * dt
+    steps = np.arange(1, n_steps)
+    drift = (mu - 0.5 * sigma ** 2) * t[1:, None]
+    vol = sigma * np.sqrt(t[1:, None])
+    counts = np.zeros((n_steps - 1) * z_bins, dtype=np.int64)
+    row_offsets = (steps - 1)[:, None] * z_bins
+    s_min, s_max = float(S0), float(S0)
+    rng = np.random.default_rng(seed)  # one stream shared by all batches
+
+    for start in range(0, n_simulations, batch_size):
+        n_batch = min(batch_size, n_simulations - start)
+        paths = simulate_gbm(S0, mu, sigma, T, dt, n_batch, seed=rng, method=method)
+        s_min = min(s_min, float(paths.min()))
+        s_max = max(s_max, float(paths.max()))
+        z = (np.log(paths[1:] / S0) - drift) / vol
+        idx = ((z + z_max) * (z_bins / (2 * z_max))).astype(np.int64)
+        np.clip(idx, 0, z_bins - 1, out=idx)
+        idx += row_offsets
+        counts += np.bincount(idx.ravel(), minlength=counts.size)
+
+    # Empirical CDF at the upper edge of every z bin, with a leading 0 at -z_max
+    cdf_edges = np.zeros((n_steps - 1, z_bins + 1))
+    np.cumsum(counts.reshape(n_steps - 1, z_bins), axis=1, out=cdf_edges[:, 1:])
+    cdf_edges /= n_simulations
+    z_width = 2 * z_max / z_bins
+
+    def quantile(q):
+        # First bin whose upper-edge CDF reaches q, then interpolate linearly inside it
+        k = np.minimum((cdf_edges[:, 1:] < q).sum(axis=1), z_bins - 1)
+        rows = np.arange(n_steps - 1)
+        c0, c1 = cdf_edges[rows, k], cdf_edges[rows, k + 1]
+        frac = np.where(c1 > c0, (q - c0) / np.where(c1 > c0, c1 - c0, 1.0), 0.5)
+        z_q = -z_max + (k + frac) * z_width
+        return np.concatenate(([S0], S0 * np.exp(drift[:, 0] + vol[:, 0] * z_q)))
+
+    def cdf(values, step):
+        values = np.asarray(values, dtype=np.float64)
+        if step == 0:
+            return (values >= S0).astype(np.float64)
+        z = (np.log(np.maximum(values, 1e-300) / S0) - drift[step - 1, 0]) / vol[step - 1, 0]
+        return np.interp(z, np.linspace(-z_max, z_max, z_bins + 1), cdf_edges[step - 1])
+
+    return {
+        't': t,
+        'q10': quantile(0.1),
+        'q50': quantile(0.5),
+        'q90': quantile(0.9),
+        's_min': s_min,
+        's_max': s_max,
+        'cdf': cdf
+    }
+
+
+def plot_forecast_streaming(S0, mu, sigma, years, n_simulations, res=12, bins=1000, seed=None,
+                            method='pseudo', batch_size=20000, return_traces=False):
+    """
+    Same plot as plot_forecast, built from summarize_gbm so that very large
+    n_simulations never hold the full path matrix in memory.
+    """
+    summary = summarize_gbm(S0, mu, sigma, years, 1 / res, n_simulations,
+                            seed=seed, method=method, batch_size=batch_size)
+    t = summary['t']
+    bin_edges = np.linspace(summary['s_min'], summary['s_max'], bins + 1)
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    # Cumulative percentage of paths below each bin's upper edge, per time interval
+    density = np.column_stack([summary['cdf'](bin_edges[1:], i) for i in range(len(t) - 1)]) * 100
+    return _forecast_figure(t, summary['q10'], summary['q50'], summary['q90'], bin_centers, density, return_traces)
+
 
+def _forecast_figure(t, q10, mean_line, q90, bin_centers, density, return_traces=False):
+    """Draw the forecast heatmap and percentile lines shared by the plot_forecast variants."""
     # Create heatmap trace with custom hovertemplate
     heatmap = go.Heatmap(
         x=t[:-1],
         y=bin_centers,
         z=density,
-        customdata=custom_heatmap,
         colorscale='Hot',
         colorbar=dict(title='Percentage (%)'),
-        hovertemplate="Time: %{x:.2f} years<br>Index Value: %{customdata}<br>Percentage: %{z:.2f}%<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>Index Value: %{y:,.0f}<br>Percentage: %{z:.2f}%<extra></extra>"
     )
 
     # Create percentile line traces with their own hovertemplates
@@ -103,8 +332,7 @@ def plot_forecast(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Pessimistic Scenario',
         line=dict(color='red', width=2),
-        customdata=custom_q10,
-        hovertemplate="Time: %{x:.2f} years<br>10th Percentile: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>10th Percentile: %{y:,.0f}<extra></extra>"
     )
 
     trace_q90 = go.Scatter(
@@ -113,8 +341,7 @@ def plot_forecast(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Optimistic Scenario',
         line=dict(color='green', width=2),
-        customdata=custom_q90,
-        hovertemplate="Time: %{x:.2f} years<br>90th Percentile: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>90th Percentile: %{y:,.0f}<extra></extra>"
     )
 
     trace_mean = go.Scatter(
@@ -123,8 +350,7 @@ def plot_forecast(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Most Likely Scenario',
         line=dict(color='blue', width=2, dash='dash'),
-        customdata=custom_mean,
-        hovertemplate="Time: %{x:.2f} years<br>Mean: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>Mean: %{y:,.0f}<extra></extra>"
     )
 
     # Calculate upper bound for y-axis (90th percentile max + 10%)
@@ -162,38 +388,38 @@ def extract_data_from_xlsx(file_path, resolution=12):
 
     known_headers = hebrew_period_to_num.keys()
 
-    wb = openpyxl.load_workbook(file_path, data_only=True)
-    sheet = wb.active
-
-    # Convert all rows to tuples of values
-    rows = list(sheet.iter_rows(values_only=True))
-
-    months_row_index = None
-    months_row = None
-
-    # identify months names row
-    for i, row in enumerate(rows):
-        row_values = [cell for cell in row if isinstance(cell, str)]
-        if len(set(row_values) & known_headers) > 1:
-            months_row_index = i
-            months_row = row
-            year_col = next((i for i, v in enumerate(months_row) if v == "שנה"), None)
-            break
-
-
-    # Collect data into a dictionary: {"YYYY-ינואר": value, ...}
-    data_dict = {}
-    if months_row_index is not None:
-        for row in rows[months_row_index + 1:]:
-            year_candidate = row[year_col]
-            if year_candidate is None:
-                continue
-            year = int(year_candidate)
-            for col_idx, month_name in enumerate(months_row[1:], start=1):
-                if month_name in known_headers and col_idx < len(row):
-                    val = row[col_idx]
-                    if val is not None:
-                        data_dict[f"{year}-{hebrew_period_to_num[month_name]}"] = val
+    # Stream the rows lazily instead of loading the whole workbook into memory
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+
+        months_row = None
+        year_col = None
+
+        # identify months names row
+        for row in rows:
+            row_values = [cell for cell in row if isinstance(cell, str)]
+            if len(set(row_values) & known_headers) > 1:
+                months_row = row
+                year_col = next((i for i, v in enumerate(months_row) if v == "שנה"), None)
+                break
+
+        # Collect data into a dictionary: {"YYYY-ינואר": value, ...}
+        # The same iterator continues with the rows after the header.
+        data_dict = {}
+        if months_row is not None:
+            for row in rows:
+                year_candidate = row[year_col] if year_col < len(row) else None
+                if year_candidate is None:
+                    continue
+                year = int(year_candidate)
+                for col_idx, month_name in enumerate(months_row[1:], start=1):
+                    if month_name in known_headers and col_idx < len(row):
+                        val = row[col_idx]
+                        if val is not None:
+                            data_dict[f"{year}-{hebrew_period_to_num[month_name]}"] = val
+    finally:
+        wb.close()
 
     return data_dict
 
@@ -208,7 +434,7 @@ def eval_params(data):
       mu (float): Mean of the log returns.
       sigma (float): Standard deviation of the log returns.
     """
-    data = np.array(data)
+    data = np.asarray(data, dtype=np.float64)
     # Step 1: Compute log returns: r_t = ln(P_t / P_(t-1))
     log_returns = np.diff(np.log(data))
     # Step 2: Estimate parameters
@@ -232,19 +458,30 @@ def rolling_params(prices, window_years=10, data_frequency=12, start_year=1994):
         sigma_years (list): Annualized volatility for each window.
     """
     window_size = window_years * data_frequency
-    times, mu_years, sigma_years = [], [], []
-    for i in range(len(prices) - window_size + 1):
-        window = prices[i : i + window_size]
-        mu, sigma = eval_params(window)
-        # Convert monthly parameters to yearly terms:
-        mu_year = mu * data_frequency            # drift scales linearly
-        sigma_year = sigma * np.sqrt(data_frequency)  # volatility scales with sqrt(time)
-        mu_years.append(mu_year)
-        sigma_years.append(sigma_year)
-        # Use the mid-point of the window to assign a time stamp
-        time_year = start_year + (i + window_size / 2) / data_frequency
-        times.append(time_year)
-    return times, mu_years, sigma_years
+    n_windows = len(prices) - window_size + 1
+    if n_windows <= 0:
+        return [], [], []
+
+    # A window of window_size prices holds w log returns. Window sums come from
+    # differences of running sums, so every window costs O(1) instead of O(w).
+    # Returns are centered first so the sum of squares doesn't lose precision.
+    w = window_size - 1
+    log_returns = np.diff(np.log(np.asarray(prices, dtype=np.float64)))
+    offset = log_returns.mean()
+    centered = log_returns - offset
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csum2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    s = csum[w:w + n_windows] - csum[:n_windows]
+    s2 = csum2[w:w + n_windows] - csum2[:n_windows]
+    mu = s / w + offset
+    sigma = np.sqrt(np.maximum(s2 - s * s / w, 0.0) / (w - 1))  # sample standard deviation
+
+    # Convert monthly parameters to yearly terms:
+    mu_years = mu * data_frequency                    # drift scales linearly
+    sigma_years = sigma * np.sqrt(data_frequency)     # volatility scales with sqrt(time)
+    # Use the mid-point of the window to assign a time stamp
+    times = start_year + (np.arange(n_windows) + window_size / 2) / data_frequency
+    return times.tolist(), mu_years.tolist(), sigma_years.tolist()
 
 def plot_rolling_params(times, mu_years, sigma_years):
     """
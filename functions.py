@@ -1,7 +1,130 @@
+import math
 import numpy as np
 import plotly.graph_objects as go
-import humanize
-from forecasting import simulate_gbm
+from numba import njit, prange
+
+# Counter-based normal generator for the kernels: every path hashes (seed, path index)
+# into its own SplitMix64 stream, so results depend only on the seed, not on how
+# prange splits paths across threads.
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_SHIFT30, _SHIFT27, _SHIFT31, _SHIFT11 = np.uint64(30), np.uint64(27), np.uint64(31), np.uint64(11)
+_INV_2_53 = 1.0 / (1 << 53)
+
+
+@njit(inline='always')
+def _splitmix64(state):
+    state = state + _GOLDEN
+    z = state
+    z = (z ^ (z >> _SHIFT30)) * _MIX1
+    z = (z ^ (z >> _SHIFT27)) * _MIX2
+    return state, z ^ (z >> _SHIFT31)
+
+
+@njit(inline='always')
+def _path_state(seed, i):
+    return _splitmix64(seed ^ (np.uint64(i) * _MIX1))[1]
+
+
+@njit(inline='always')
+def _normal_pair(state):
+    """Two independent standard normals via Box-Muller."""
+    state, a = _splitmix64(state)
+    state, b = _splitmix64(state)
+    u1 = ((a >> _SHIFT11) + np.uint64(1)) * _INV_2_53  # in (0, 1], keeps log finite
+    u2 = (b >> _SHIFT11) * _INV_2_53
+    r = math.sqrt(-2.0 * math.log(u1))
+    return state, r * math.cos(2 * math.pi * u2), r * math.sin(2 * math.pi * u2)
+
+
+def _kernel_seed(rng):
+    """uint64 kernel seed from a Generator, an int seed, or None (fresh entropy)."""
+    return np.random.default_rng(rng).integers(0, 2**64, dtype=np.uint64)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _investment_paths(init_balance, initial_fortune, contributions, transaction_fee,
+                      monthly_fee_rate, ILS_management_fee, tax_rate, mu, sigma, dt, seed,
+                      paths, taxed, final_untaxed, final_taxed):
+    """
+    Numba kernel fusing the monthly deposit, fees, market growth and tax steps
+    of simulate_investment. Final balances are written for every simulation;
+    full monthly balances only for the first paths.shape[1] of them (paths are
+    i.i.d., so those form an unbiased sample).
+    """
+    months = contributions.shape[0]
+    n_kept = paths.shape[1]
+    drift = (mu - 0.5 * sigma * sigma) * dt
+    vol = sigma * math.sqrt(dt)
+    for i in prange(final_untaxed.shape[0]):
+        keep = i < n_kept
+        state = _path_state(seed, i)
+        z_next = 0.0
+        balance = init_balance
+        taxed_balance = balance
+        total_deposits = initial_fortune
+        if keep:
+            paths[0, i] = balance
+            taxed[0, i] = balance
+        for m in range(months):
+            contribution = contributions[m]
+            balance += int(contribution * (1 - transaction_fee / 100))  # make deposit/ withdrawal
+            balance = balance * (1 - monthly_fee_rate) - ILS_management_fee  # pay management fees
+            if m % 2 == 0:
+                state, z, z_next = _normal_pair(state)
+            else:
+                z = z_next
+            balance *= math.exp(drift + vol * z)  # apply interest
+            taxed_balance = balance - (balance - total_deposits) * (tax_rate / 100)
+            total_deposits += contribution
+            if keep:
+                paths[m + 1, i] = balance
+                taxed[m + 1, i] = taxed_balance
+        final_untaxed[i] = balance
+        final_taxed[i] = taxed_balance
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _buying_paths(S0, mu, sigma, dt, seed, mortgage_balance, maintenance_cost_rate, fixed_maintenance_cost,
+                  property_out, net_equity_out, final_property_out, final_net_equity_out, total_maintenance_out):
+    """
+    Numba kernel fusing property appreciation, maintenance accumulation and net
+    equity. Each path keeps its property value and cumulative maintenance in
+    registers, so the path matrix is walked once instead of once per quantity.
+    Final values are written for every simulation; monthly paths only for the
+    first property_out.shape[1] of them.
+    """
+    n_steps = mortgage_balance.shape[0]
+    n_kept = property_out.shape[1]
+    drift = (mu - 0.5 * sigma * sigma) * dt
+    vol = sigma * math.sqrt(dt)
+    for i in prange(final_property_out.shape[0]):
+        keep = i < n_kept
+        state = _path_state(seed, i)
+        z_next = 0.0
+        s = S0
+        cumulative_maintenance = 0.0
+        net_equity = s - mortgage_balance[0]
+        if keep:
+            property_out[0, i] = s
+            net_equity_out[0, i] = net_equity
+        for t in range(1, n_steps):
+            if t % 2 == 1:
+                state, z, z_next = _normal_pair(state)
+            else:
+                z = z_next
+            s *= math.exp(drift + vol * z)
+            # annual maintenance is property_value * rate + fixed cost, prorated monthly
+            cumulative_maintenance += (s * (maintenance_cost_rate / 100) + fixed_maintenance_cost) / 12
+            net_equity = s - mortgage_balance[t] - cumulative_maintenance
+            if keep:
+                property_out[t, i] = s
+                net_equity_out[t, i] = net_equity
+        final_property_out[i] = s
+        final_net_equity_out[i] = net_equity
+        total_maintenance_out[i] = cumulative_maintenance
+
 
 def simulate_investment(initial_fortune,
                         years,
@@ -12,18 +135,18 @@ def simulate_investment(initial_fortune,
                         initial_already_invested=True,
                         contributions_schedule=None,
                         forecast_params={'mu':0.07, 'sigma':0.15},
-                        n_sim=100):
+                        n_sim=100,
+                        sample_size=None,
+                        rng=None):
     """
     Simulates the evolution of an investment account over a specified number of years,
     incorporating monthly contributions, transaction fees, management fees, interest accrual,
     and taxation on profits.
 
     The function works as follows:
-      1. It generates a full GBM forecast (with S0=1) for the simulation period using simulate_gbm.
-      2. Monthly interest multipliers are computed from the GBM path by taking the ratio
-         of consecutive time steps. The resulting multipliers are reshaped into a 2D array
-         with dimensions [years][12], so that each month’s multiplier is accessible as:
-             monthly_interest[year_idx][month_idx]
+      1. The contributions schedule is flattened into one contribution per month.
+      2. A Numba kernel (_investment_paths) walks every simulation path in parallel,
+         drawing the monthly GBM interest multiplier on the fly.
       3. The simulation loop then updates the account balance each month:
            a. A monthly contribution (with transaction fee applied) is added.
            b. Management fees are deducted—both as a monthly percentage fee (converted from an annual rate)
@@ -41,19 +164,25 @@ def simulate_investment(initial_fortune,
         percentace_management_fee (float): Annual management fee (in percent), applied monthly (default 0).
         ILS_management_fee (float): Fixed monthly management fee in ILS (default 0).
         initial_already_invested (bool): If True, the initial_fortune is assumed fully invested (thus exempt from transaction fees).
-        contributions_schedule (list of lists, optional): A 2D list with dimensions [years][12] specifying the contribution amount for each month.
+        contributions_schedule (list of lists or ndarray, optional): A 2D list or array with dimensions [years][12] specifying the contribution amount for each month.
+            It must cover at least `years` years; a shorter schedule raises ValueError.
         forecast_params (dict): Parameters for the GBM forecast; must include 'mu' (annual drift) and 'sigma' (annual volatility).
         n_sim (int): Number of simulation paths.
+        sample_size (int, optional): If given, monthly balances are only kept for this many paths;
+            final balances are still computed for all n_sim paths.
+        rng (np.random.Generator or int, optional): Source of the kernel seed; the same int seed
+            reproduces the same paths. Defaults to fresh entropy.
 
     Returns:
-        tuple: A tuple (paths, taxed) where:
-            - paths is a NumPy array of untaxed account balances at each month (shape: (months+1, n_sim)).
-            - taxed is a NumPy array of taxed account balances at each month, where tax is applied to the profit.
+        dict with:
+            - 'final_investment_paths_untaxed': float32 array of untaxed account balances at each month
+              (shape: (months+1, n_sim), or (months+1, sample_size) when sampling).
+            - 'final_investment_paths_taxed': the same for taxed balances, where tax is applied to the profit.
+            - 'final_value_untaxed' / 'final_value_taxed': final balances of all n_sim paths.
 
     Notes:
-        - The function first computes market_paths using simulate_gbm. From these, it derives monthly interest multipliers as:
-              monthly_interest = (market_paths[1:] / market_paths[:-1]).reshape(years, 12, -1)
-          so that for each month the multiplier is available as monthly_interest[year_idx][month_idx].
+        - The monthly interest multiplier is exp((mu - sigma^2 / 2) * dt + sigma * sqrt(dt) * z), the same
+          ratio of consecutive steps a GBM forecast with dt=1/12 would produce.
         - For each month, the balance is updated by first adding the contribution (adjusted by transaction fees),
           applying management fees, and then applying the corresponding interest multiplier.
         - The taxed balance is calculated for each month as:
@@ -61,127 +190,126 @@ def simulate_investment(initial_fortune,
           which applies tax on the gains (the difference between the current balance and the total deposits so far).
     """
 
-    market_paths = simulate_gbm(S0=1,
-                                mu=forecast_params['mu'],
-                                sigma=forecast_params['sigma'],
-                                T=years,
-                                dt=1/12,
-                                n_simulations=n_sim)
-
-    monthly_interest = (market_paths[1:] / market_paths[:-1]).reshape(years, 12, -1)
-
-    # Initial setup
     months = years * 12
     init_balance = initial_fortune if initial_already_invested else initial_fortune * (1 - transaction_fee / 100)
-    balances = np.full(n_sim, init_balance)
-    total_deposits = np.full(n_sim, initial_fortune)
-    monthly_paths = [balances.copy()]
-    taxed_paths = [balances.copy()]
-
-    for m in range(1, months + 1):
-        year_idx = (m - 1) // 12
-        month_idx = (m - 1) % 12
-        current_contribution = contributions_schedule[year_idx][month_idx]
-        balances += int(current_contribution * (1 - transaction_fee / 100))  # make deposit/ withdrawal
-        monthly_fee_rate = percentace_management_fee / 100 / 12
-        balances = (balances * (1 - monthly_fee_rate)) - ILS_management_fee  # pay management fees
-        balances = balances * monthly_interest[year_idx][month_idx]  # apply interest
-
-        taxed_balance = balances - (balances - total_deposits) * (tax_rate / 100)
-        taxed_paths.append(taxed_balance.copy())
-
-        total_deposits += current_contribution
-        monthly_paths.append(balances.copy())
-
-    paths = np.array(monthly_paths)
-    taxed = np.array(taxed_paths)
+    contributions = np.asarray(contributions_schedule, dtype=np.float64).reshape(-1)
+    if contributions.size < months:
+        raise ValueError(f"contributions_schedule covers {contributions.size} months, "
+                         f"but the simulation runs for {months} ({years} years)")
+    contributions = contributions[:months]
+    n_kept = n_sim if sample_size is None else min(sample_size, n_sim)
+    paths = np.empty((months + 1, n_kept), dtype=np.float32)
+    taxed = np.empty((months + 1, n_kept), dtype=np.float32)
+    final_untaxed = np.empty(n_sim)
+    final_taxed = np.empty(n_sim)
+    _investment_paths(float(init_balance),
+                      float(initial_fortune),
+                      contributions,
+                      float(transaction_fee),
+                      percentace_management_fee / 100 / 12,
+                      float(ILS_management_fee),
+                      float(tax_rate),
+                      float(forecast_params['mu']),
+                      float(forecast_params['sigma']),
+                      1 / 12,
+                      _kernel_seed(rng),
+                      paths,
+                      taxed,
+                      final_untaxed,
+                      final_taxed)
     return {
             'final_investment_paths_untaxed': paths,
-            'final_investment_paths_taxed': taxed
+            'final_investment_paths_taxed': taxed,
+            'final_value_untaxed': final_untaxed,
+            'final_value_taxed': final_taxed
             }
 
-def simulate_property_value(apartment_price, years, forecast_params={'mu': 0.05, 'sigma': 0.05}, n_sim=100):
-    property_paths = simulate_gbm(S0=apartment_price,
-                                  mu=forecast_params['mu'],
-                                  sigma=forecast_params['sigma'],
-                                  T=years,
-                                  dt=1/12,
-                                  n_simulations=n_sim)
-    return property_paths
-
-
-def simulate_buying_scenario(property_value_paths,
-                             mortgage,
-                             years,
-                             maintenance_cost_rate,
-                             fixed_maintenance_cost):
+def warmup_kernels():
+    """Compile the Numba kernels with a tiny run."""
+    _buying_paths(1.0, 0.0, 0.0, 1 / 12, _kernel_seed(0), np.zeros(13), 0.0, 0.0,
+                  np.empty((13, 1), dtype=np.float32), np.empty((13, 1), dtype=np.float32),
+                  np.empty(2), np.empty(2), np.empty(2))
+    simulate_investment(initial_fortune=1, years=1, tax_rate=0, contributions_schedule=[[0] * 12], n_sim=2, rng=0)
+
+
+def _mortgage_monthly_arrays(mortgage, total_months):
     """
-    Simulates the buying scenario similar to simulate_investment:
-      - Uses mortgage.calc_amortization_schedule() for monthly mortgage details.
-      - Uses simulate_gbm to simulate property appreciation.
-      - Calculates monthly maintenance cost (variable and fixed) and accumulates it.
-      - Returns summary values plus monthly paths.
+    Reads the mortgage amortization array into monthly balance, interest and
+    principal arrays of length total_months + 1 (month 0 holds the full loan).
+    The schedule is the same for every path, so it is built once and broadcast.
     """
-    total_months = years * 12
-
-    # Obtain the mortgage amortization schedule (a list of dicts for each month)
-    amortization_schedule = mortgage.amortization_schedule
-    mortgage_term_months = len(amortization_schedule)
+    amortization = mortgage.amortization_array
+    n = min(len(amortization), total_months)
 
-    # Initialize arrays for monthly mortgage data
+    # After the mortgage term the loan is fully paid off, so the arrays stay zero.
     monthly_mortgage_balance = np.zeros(total_months + 1)
     monthly_interest_paid = np.zeros(total_months + 1)
     monthly_principal_paid = np.zeros(total_months + 1)
 
     # At month 0, the mortgage balance is the full loan amount.
     monthly_mortgage_balance[0] = mortgage.total_loan_value
-
-    # For each month, if within the mortgage term, read the values from the schedule.
-    for m in range(1, total_months + 1):
-        if m <= mortgage_term_months:
-            entry = amortization_schedule[m - 1]
-            # Convert humanized strings to numbers
-            monthly_mortgage_balance[m] = int(entry["remaining_balance"].replace(',', ''))
-            monthly_interest_paid[m] = int(entry.get("interest_payment", "0").replace(',', ''))
-            monthly_principal_paid[m] = int(entry.get("principal_payment", "0").replace(',', ''))
-        else:
-            # After the mortgage term, assume it's fully paid off.
-            monthly_mortgage_balance[m] = 0
-            monthly_interest_paid[m] = 0
-            monthly_principal_paid[m] = 0
-
-    n_paths = property_value_paths.shape[1]
-
-    # Calculate monthly maintenance cost for all simulation paths.
-    # Assume annual maintenance cost is: property_value * (maintenance_cost_rate/100) + fixed_maintenance_cost.
-    # We then prorate it monthly.
-    monthly_maintenance = np.zeros((total_months + 1, n_paths))
-    monthly_cumulative_maintenance = np.zeros((total_months + 1, n_paths))
-    for m in range(1, total_months + 1):
-        annual_maintenance = property_value_paths[m, :] * (maintenance_cost_rate / 100) + fixed_maintenance_cost
-        monthly_cost = annual_maintenance / 12
-        monthly_maintenance[m, :] = monthly_cost
-        monthly_cumulative_maintenance[m, :] = monthly_cumulative_maintenance[m - 1, :] + monthly_cost
-
-    # Compute monthly net equity for all simulation paths.
-    monthly_net_equity = property_value_paths - monthly_mortgage_balance[:, None] - monthly_cumulative_maintenance
-
-    # Compute summary values from the simulation for each path.
-    final_property_value = property_value_paths[-1, :]
-    remaining_mortgage = monthly_mortgage_balance[-1]  # Mortgage remains the same across simulations
-    total_maintenance_cost = monthly_cumulative_maintenance[-1, :]
-    net_equity = monthly_net_equity[-1, :]
+    monthly_mortgage_balance[1:n + 1] = amortization[:n, 3]
+    monthly_interest_paid[1:n + 1] = amortization[:n, 1]
+    monthly_principal_paid[1:n + 1] = amortization[:n, 2]
+
+    return monthly_mortgage_balance, monthly_interest_paid, monthly_principal_paid
+
+
+def simulate_buying_paths(apartment_price,
+                          years,
+                          forecast_params,
+                          mortgage,
+                          maintenance_cost_rate,
+                          fixed_maintenance_cost,
+                          n_sim=100,
+                          sample_size=None,
+                          rng=None):
+    """
+    Simulates the buying scenario: property appreciation (monthly GBM steps),
+    maintenance (variable and fixed, accumulated monthly) and net equity are
+    produced by a single Numba kernel pass, with the mortgage schedule from
+    mortgage.amortization_array. Returns summary values plus monthly paths.
+
+    If sample_size is given, 'property_value_paths' and 'monthly_net_equity' only
+    hold that many paths, while the final-value arrays still cover all n_sim
+    paths, so memory scales with n_sim + sample_size * months instead of
+    n_sim * months.
+
+    rng (Generator, int or None) seeds the kernel; the same int seed reproduces
+    the same paths.
+    """
+    total_months = years * 12
+    monthly_mortgage_balance, monthly_interest_paid, monthly_principal_paid = _mortgage_monthly_arrays(mortgage, total_months)
+
+    n_kept = n_sim if sample_size is None else min(sample_size, n_sim)
+    property_value_paths = np.empty((total_months + 1, n_kept), dtype=np.float32)
+    monthly_net_equity = np.empty((total_months + 1, n_kept), dtype=np.float32)
+    final_property_value = np.empty(n_sim)
+    net_equity = np.empty(n_sim)
+    total_maintenance_cost = np.empty(n_sim)
+    _buying_paths(float(apartment_price),
+                  float(forecast_params['mu']),
+                  float(forecast_params['sigma']),
+                  1 / 12,
+                  _kernel_seed(rng),
+                  monthly_mortgage_balance,
+                  float(maintenance_cost_rate),
+                  float(fixed_maintenance_cost),
+                  property_value_paths,
+                  monthly_net_equity,
+                  final_property_value,
+                  net_equity,
+                  total_maintenance_cost)
 
     return {
+        'property_value_paths': property_value_paths,
         'final_property_value': final_property_value,
-        'remaining_mortgage': remaining_mortgage,
+        'remaining_mortgage': monthly_mortgage_balance[-1],
         'total_maintenance_cost': total_maintenance_cost,
         'net_equity': net_equity,
         'monthly_principal_paid': monthly_principal_paid,
         'monthly_interest_paid': monthly_interest_paid,
         'monthly_mortgage_balance': monthly_mortgage_balance,
-        'monthly_maintenance': monthly_maintenance,
-        'monthly_cumulative_maintenance': monthly_cumulative_maintenance,
         'monthly_net_equity': monthly_net_equity
     }
 
@@ -200,38 +328,36 @@ def plot_paths(paths, years, res=12, bins=1000, return_traces=False):
     """
     t = np.linspace(0, years, int(years * res) + 1)
     n_simulations = paths.shape[1]
-    # Calculate the 10th, 90th percentiles, and mean for each time step
-    q10 = np.percentile(paths, 10, axis=1)
-    q90 = np.percentile(paths, 90, axis=1)
-    mean_line = np.percentile(paths, 50, axis=1)
+    # Calculate the 10th, 90th percentiles, and mean for each time step (one shared sort)
+    q10, mean_line, q90 = np.quantile(paths, [0.1, 0.5, 0.9], axis=1)
 
     # Determine bins for S values across all paths
     S_min = np.min(paths)
     S_max = np.max(paths)
-    bin_edges = np.linspace(S_min, S_max, bins + 1)
-    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-    formatted_bin_centers = [humanize.intcomma(int(val)) for val in bin_centers]
-    custom_heatmap = np.tile(formatted_bin_centers, (len(t) - 1, 1)).T
-    custom_q10 = [humanize.intcomma(int(val)) for val in q10]
-    custom_q90 = [humanize.intcomma(int(val)) for val in q90]
-    custom_mean = [humanize.intcomma(int(val)) for val in mean_line]
+    bin_width = (S_max - S_min) / bins
+    bin_centers = S_min + (np.arange(bins) + 0.5) * bin_width
 
     # Create a percentage density matrix for time intervals (one fewer than len(t))
-    density = np.zeros((bins, len(t) - 1))
-    for i in range(len(t) - 1):
-        counts, _ = np.histogram(paths[i, :], bins=bin_edges, density=False)
-        cum_counts = np.cumsum(counts)  # cumulative counts over the bins
-        density[:, i] = (cum_counts / n_simulations) * 100  # convert to percentage
+    # The bins are uniform, so each value's bin is plain arithmetic (last bin closed,
+    # as in np.histogram); then count all time steps with one bincount over
+    # (time step, bin) pairs.
+    n_intervals = len(t) - 1
+    inv_width = 1 / bin_width if bin_width > 0 else 0.0
+    idx = ((paths[:n_intervals] - S_min) * inv_width).astype(np.intp)
+    np.clip(idx, 0, bins - 1, out=idx)
+    idx += np.arange(n_intervals)[:, None] * bins
+    counts = np.bincount(idx.ravel(), minlength=n_intervals * bins).reshape(n_intervals, bins)
+    cum_counts = np.cumsum(counts, axis=1)  # cumulative counts over the bins
+    density = (cum_counts.T / n_simulations) * 100  # convert to percentage
 
     # Create heatmap trace with custom hovertemplate
     heatmap = go.Heatmap(
         x=t[:-1],
         y=bin_centers,
         z=density,
-        customdata=custom_heatmap,
         colorscale='Hot',
         colorbar=dict(title='Percentage (%)'),
-        hovertemplate="Time: %{x:.2f} years<br>Index Value: %{customdata}<br>Percentage: %{z:.2f}%<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>Index Value: %{y:,.0f}<br>Percentage: %{z:.2f}%<extra></extra>"
     )
 
     # Create percentile line traces with their own hovertemplates
@@ -241,8 +367,7 @@ def plot_paths(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Pessimistic Scenario',
         line=dict(color='red', width=2),
-        customdata=custom_q10,
-        hovertemplate="Time: %{x:.2f} years<br>10th Percentile: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>10th Percentile: %{y:,.0f}<extra></extra>"
     )
 
     trace_q90 = go.Scatter(
@@ -251,8 +376,7 @@ def plot_paths(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Optimistic Scenario',
         line=dict(color='green', width=2),
-        customdata=custom_q90,
-        hovertemplate="Time: %{x:.2f} years<br>90th Percentile: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>90th Percentile: %{y:,.0f}<extra></extra>"
     )
 
     trace_mean = go.Scatter(
@@ -261,8 +385,7 @@ def plot_paths(paths, years, res=12, bins=1000, return_traces=False):
         mode='lines',
         name='Most Likely Scenario',
         line=dict(color='blue', width=2, dash='dash'),
-        customdata=custom_mean,
-        hovertemplate="Time: %{x:.2f} years<br>Mean: %{customdata}<extra></extra>"
+        hovertemplate="Time: %{x:.2f} years<br>Mean: %{y:,.0f}<extra></extra>"
     )
 
     # Calculate upper bound for y-axis (90th percentile max + 10%)
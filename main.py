@@ -25,47 +25,92 @@ This simulation compares three financial strategies over a multi‐year period:
 """
 
 # === Imports ===
+import os
+import json
+import hashlib
 import numpy as np
 import datetime
-from dataclasses import dataclass
-from typing import List
-import humanize  # For human-friendly number formatting
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from functions import simulate_investment, simulate_buying_scenario, plot_paths, simulate_property_value
+from joblib import Memory
+import functions
+import mortgage_calc
+from functions import simulate_investment, simulate_buying_paths, plot_paths
 from mortgage_calc import mortgage_factory
 
 # Simulation settings
 SIMULATION_START_DATE = datetime.date.today()
 SIMULATION_YEARS = 30  # Duration of simulation in years
 PLOT_RESULTS = True
+# Reuse the stored results of an identical earlier run from the on-disk cache. Off by
+# default: only seeded runs (RANDOM_SEED set) are cached, since an unseeded run would
+# otherwise freeze its first random draw, and a cache hit skips the per-scenario output.
+CACHE_RESULTS = False
 N_SIM = 10000
+RANDOM_SEED = None  # Set an int to make runs reproducible
 
 STOCKS_TAX_RATE = 25  # Tax rate on investment gains (in percent)
 
 # === Classes ===
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class MortgageSchedule:
+    """The parts of a mortgage the simulation reads, with read-only arrays so cached copies can be shared."""
+    total_loan_value: float
+    amortization_array: np.ndarray  # read by simulate_buying_paths, with total_loan_value
+    payment_list: np.ndarray
+
+
+def _params_json(params):
+    """Canonical JSON of mortgage parameters; array values (cpi_list, rate lists) become lists."""
+    return json.dumps(params, sort_keys=True, default=lambda value: np.asarray(value).tolist())
+
+
+@lru_cache(maxsize=128)
+def _cached_mortgage_schedule(params_json):
+    """mortgage_factory memoized on the canonical JSON of its parameters, keeping only the immutable schedule."""
+    mortgage = mortgage_factory(json.loads(params_json))
+    amortization_array = mortgage.amortization_array.copy()
+    payment_list = np.asarray(mortgage.get_payment_list(), dtype=np.float64)
+    amortization_array.setflags(write=False)
+    payment_list.setflags(write=False)
+    return MortgageSchedule(mortgage.total_loan_value, amortization_array, payment_list)
+
+
+@dataclass(slots=True)
 class FinancialProfile:
     """Stores personal financial data."""
-    monthly_free_income: list
+    monthly_free_income: np.ndarray  # (years, 12) free income for every simulation month
     savings: int
 
+    def __post_init__(self):
+        # Convert once so every consumer gets the same contiguous float64 buffer
+        self.monthly_free_income = np.asarray(self.monthly_free_income, dtype=np.float64)
+
 
-@dataclass
+@dataclass(slots=True)
 class Scenario:
     """Base class for a financial scenario."""
     name: str
     profile: FinancialProfile
+    results: dict = field(init=False, repr=False, compare=False)
 
-    def simulate(self):
+    def simulate(self, rng=None, return_paths=True):
+        """Run the scenario. With return_paths=False only one monthly path is kept
+        (final values still cover every simulation), for runs that don't plot."""
         raise NotImplementedError("Simulation method not implemented.")
 
     def print_results(self):
         raise NotImplementedError("Simulation method not implemented.")
 
 
-@dataclass
+@dataclass(slots=True)
 class BuyingScenario(Scenario):
     """Simulation scenario for buying an apartment."""
     apartment_price: float
@@ -76,62 +121,70 @@ class BuyingScenario(Scenario):
     simulation_years: int
     maintenance_cost_rate: float
     fixed_maintenance_cost: int
+    mortgage: MortgageSchedule = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.mortgage = mortgage_factory(self.mortgage_params)
+        self.mortgage = _cached_mortgage_schedule(_params_json(self.mortgage_params))
 
         if self.mortgage.total_loan_value + self.down_payment != self.apartment_price:
             raise ValueError(f"Inconsistent financing for the apartment:\n"
                              f"{self.apartment_price = }\n{self.down_payment = }\n{self.apartment_price = }")
-        for i, payment in enumerate(self.mortgage.get_payment_list()):
-            if payment > self.profile.monthly_free_income[i//12][1%12]:
-                raise ValueError(f'monthly free income is less than mortgage payment')
+        # Compare every month's payment with that month's free income at once
+        income = self.profile.monthly_free_income.ravel()
+        n_months = min(len(self.mortgage.payment_list), len(income))
+        short = np.flatnonzero(self.mortgage.payment_list[:n_months] > income[:n_months])
+        if short.size:
+            year, month = divmod(int(short[0]), 12)
+            raise ValueError(f'monthly free income is less than mortgage payment '
+                             f'(first in year {year + 1}, month {month + 1})')
 
 
 
     def print_results(self):  # TODO: fix.
         print("=== Buying Scenario Results ===")
-        print(f"Apartment Purchase Price: {humanize.intcomma(self.apartment_price)} ILS")
-        print(f"Down Payment: {humanize.intcomma(self.down_payment)} ILS")
-        print(f"Mortgage Loan: {humanize.intcomma(self.apartment_price - self.down_payment)} ILS")
-        print(f"Final Property Value after {self.simulation_years} years: {humanize.intcomma(round(self.results['final_property_value']))} ILS")
-        print(f"Remaining Mortgage Balance: {humanize.intcomma(round(self.results['remaining_mortgage']))} ILS")
+        print(f"Apartment Purchase Price: {self.apartment_price:,} ILS")
+        print(f"Down Payment: {self.down_payment:,} ILS")
+        print(f"Mortgage Loan: {self.apartment_price - self.down_payment:,} ILS")
+        print(f"Final Property Value after {self.simulation_years} years: {round(self.results['final_property_value']):,} ILS")
+        print(f"Remaining Mortgage Balance: {round(self.results['remaining_mortgage']):,} ILS")
         total_principal_payed = sum(self.results['monthly_principal_paid'])
-        print(f"Total Principal Paid: {humanize.intcomma(round(total_principal_payed))} ILS")
+        print(f"Total Principal Paid: {round(total_principal_payed):,} ILS")
         total_interest_paid = sum(self.results['monthly_interest_paid'])
-        print(f"Total Interest Paid: {humanize.intcomma(round(total_interest_paid))} ILS")
-        print(f"Total Mortgage Payments Made: {humanize.intcomma(round(total_principal_payed + total_interest_paid))} ILS")
-        print(f"Total Maintenance Costs: {humanize.intcomma(round(self.results['total_maintenance_cost']))} ILS")
-        print(f"Net Equity (Final Value - Mortgage - Maintenance): {humanize.intcomma(round(self.results['net_equity']))} ILS")
+        print(f"Total Interest Paid: {round(total_interest_paid):,} ILS")
+        print(f"Total Mortgage Payments Made: {round(total_principal_payed + total_interest_paid):,} ILS")
+        print(f"Total Maintenance Costs: {round(self.results['total_maintenance_cost']):,} ILS")
+        print(f"Net Equity (Final Value - Mortgage - Maintenance): {round(self.results['net_equity']):,} ILS")
         print("=" * 40)
 
-    def simulate(self):
+    def simulate(self, rng=None, return_paths=True):
         print(f"\nSimulating {self.name} (Buying):")
 
-        property_value = simulate_property_value(
+        # Property values, maintenance and net equity come from one fused kernel
+        # pass, without materializing an intermediate property path matrix first.
+        self.results = simulate_buying_paths(
             apartment_price=self.apartment_price,
             years=self.simulation_years,
-            forecast_params={'mu': 0.05, 'sigma': 0.05},
-            n_sim=self.n_sim
-        )
-        self.results = {'property_value_paths': property_value}
-
-        buying_results = simulate_buying_scenario(
-            property_value_paths=property_value,
+            forecast_params=self.forecast_params,
             mortgage=self.mortgage,
-            years=self.simulation_years,
             maintenance_cost_rate=self.maintenance_cost_rate,
-            fixed_maintenance_cost=self.fixed_maintenance_cost
+            fixed_maintenance_cost=self.fixed_maintenance_cost,
+            n_sim=self.n_sim,
+            sample_size=None if return_paths else 1,
+            rng=rng
         )
-        self.results.update(buying_results)
 
-        free_income = np.array(self.profile.monthly_free_income) - np.array(self.results['monthly_maintenance'][1:, 0]).reshape(30, 12) - np.array(self.mortgage.get_payment_list()).reshape(30, 12)
+        shape = (self.simulation_years, 12)
+        # maintenance of the first path, prorated monthly as in the kernel
+        maintenance = ((self.results['property_value_paths'][1:, 0] * (self.maintenance_cost_rate / 100)
+                        + self.fixed_maintenance_cost) / 12).reshape(shape)
+        payments = self.mortgage.payment_list[:maintenance.size].reshape(shape)
+        free_income = self.profile.monthly_free_income - maintenance - payments
         # TODO: invest free income
         # self.print_results()
         return self.results
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestmentScenario(Scenario):
     """Simulation scenario for direct investment of full income."""
     tax_rate: float
@@ -145,15 +198,15 @@ class InvestmentScenario(Scenario):
 
     def print_results(self):
         print("=== Direct Investment Scenario Results ===")
-        print(f"Monthly Investment (Full Income): {humanize.intcomma(np.mean(self.profile.monthly_free_income))} ILS")
-        # Compute average final balance from the Monte Carlo paths
-        avg_final_balance_untaxed = np.percentile(self.results['final_investment_paths_untaxed'][-1, :], 50)
-        print(f"Average Final Investment Value (Untaxed): {humanize.intcomma(round(avg_final_balance_untaxed))} ILS")
-        avg_final_balance_taxed = np.percentile(self.results['final_investment_paths_taxed'][-1, :], 50)
-        print(f"Average Final Investment Value (taxed): {humanize.intcomma(round(avg_final_balance_taxed))} ILS")
+        print(f"Monthly Investment (Full Income): {np.mean(self.profile.monthly_free_income):,} ILS")
+        # Compute average final balance from the final value of every Monte Carlo path
+        avg_final_balance_untaxed = np.median(self.results['final_value_untaxed'])
+        print(f"Average Final Investment Value (Untaxed): {round(avg_final_balance_untaxed):,} ILS")
+        avg_final_balance_taxed = np.median(self.results['final_value_taxed'])
+        print(f"Average Final Investment Value (taxed): {round(avg_final_balance_taxed):,} ILS")
         print("=" * 40)
 
-    def simulate(self):
+    def simulate(self, rng=None, return_paths=True):
         print(f"\nSimulating {self.name} (Direct Investment):")
 
         self.results = simulate_investment(
@@ -166,13 +219,55 @@ class InvestmentScenario(Scenario):
             initial_already_invested=self.initial_already_invested,
             contributions_schedule=self.profile.monthly_free_income,
             forecast_params=self.forecast_params,
-            n_sim=self.n_sim
+            n_sim=self.n_sim,
+            sample_size=None if return_paths else 1,
+            rng=rng
         )
         self.print_results()
         return self.results
 
 
-@dataclass
+def _run_scenario(scenario, seed_sequence, return_paths):
+    """Worker entry point: simulate one scenario and return its name with the results."""
+    print(f"--- Scenario: {scenario.name} ---")
+    return scenario.name, scenario.simulate(rng=np.random.default_rng(seed_sequence), return_paths=return_paths)
+
+
+def _simulate_scenarios(scenarios, seed=None, return_paths=True):
+    """Simulate every scenario and return {name: results}."""
+    # One SeedSequence for the run, split into an independent child stream per
+    # scenario: a fixed seed reproduces the run whether the scenarios execute in
+    # one process or several, and the workers never share a random stream.
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(scenarios))
+    return_paths = [return_paths] * len(scenarios)
+    n_workers = min(os.cpu_count() or 1, len(scenarios))
+    if n_workers > 1:
+        # spawn rather than fork: the parent may already run Numba's OpenMP thread pool
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=get_context("spawn")) as pool:
+            return dict(pool.map(_run_scenario, scenarios, seed_sequences, return_paths))
+    return dict(map(_run_scenario, scenarios, seed_sequences, return_paths))
+
+
+# On-disk memo keyed on a hash of the scenarios' fields (profile, prices, mortgage,
+# forecast parameters, n_sim, years), the seed and the simulation source, so rerunning
+# unchanged inputs with unchanged code loads the stored paths.
+memory = Memory(location=os.environ.get('TBONTB_CACHE_DIR', '/tmp/tbontb_cache'), verbose=0)
+
+
+def _source_version():
+    """Hash of the simulation source files; joblib itself only tracks the cached function's own code."""
+    digest = hashlib.blake2b(digest_size=16)
+    for module_file in (__file__, functions.__file__, mortgage_calc.__file__):
+        digest.update(Path(module_file).read_bytes())
+    return digest.hexdigest()
+
+
+@memory.cache
+def _simulate_scenarios_cached(scenarios, seed, return_paths, source_version):
+    return _simulate_scenarios(scenarios, seed=seed, return_paths=return_paths)
+
+
+# @dataclass
 # class RentingScenario(Scenario):
 #     """Simulation scenario for renting and investing the surplus."""
 #     monthly_rent: float
@@ -180,12 +275,11 @@ class InvestmentScenario(Scenario):
 #
 #     def print_results(self):
 #         print("=== Renting Scenario Results ===")
-#         print(f"Monthly Rent: {humanize.intcomma(self.monthly_rent)} ILS")
-#         print(f"Monthly Surplus Invested: {humanize.intcomma(self.monthly_surplus)} ILS")
-#         # Compute average final balance from the Monte Carlo paths
-#         final_balances = [path[-1] for path in self.results['paths']]
-#         avg_final_balance = sum(final_balances) / len(final_balances)
-#         print(f"Average Final Investment Value (Untaxed): {humanize.intcomma(round(avg_final_balance))} ILS")
+#         print(f"Monthly Rent: {self.monthly_rent:,} ILS")
+#         print(f"Monthly Surplus Invested: {self.monthly_surplus:,} ILS")
+#         # Compute average final balance from the Monte Carlo final values
+#         avg_final_balance = float(self.results['final_value_untaxed'].mean())
+#         print(f"Average Final Investment Value (Untaxed): {round(avg_final_balance):,} ILS")
 #         print("=" * 40)
 #
 #     def simulate(self):
@@ -201,7 +295,7 @@ class InvestmentScenario(Scenario):
 #             tax_rate=STOCKS_TAX_RATE,
 #             n_sim=N_SIM
 #         )
-#         cumulative_rent = [self.monthly_rent * 12 * i for i in range(1, SIMULATION_YEARS + 1)]
+#         cumulative_rent = self.monthly_rent * 12 * np.arange(1, SIMULATION_YEARS + 1)
 #         self.print_results()
 #         return {
 #             'final_investment_paths': self.results['paths'],
@@ -209,21 +303,25 @@ class InvestmentScenario(Scenario):
 #         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationEngine:
     """Core engine to run the financial simulation."""
     profile: FinancialProfile
-    scenarios: List[Scenario]
+    scenarios: Tuple[Scenario, ...]
     start_date: datetime.date
     years: int
+    seed: Optional[int] = None
 
     def run(self):
         print("Starting Financial Simulation...\n")
-        all_results = {}
-        for scenario in self.scenarios:
-            print(f"--- Scenario: {scenario.name} ---")
-            data = scenario.simulate()
-            all_results[scenario.name] = data
+        # Full path matrices are only needed for the plots
+        if CACHE_RESULTS and self.seed is not None:
+            args = (self.scenarios, self.seed, PLOT_RESULTS, _source_version())
+            if _simulate_scenarios_cached.check_call_in_cache(*args):
+                print(f"Loading stored results of the run with seed {self.seed}.")
+            all_results = _simulate_scenarios_cached(*args)
+        else:
+            all_results = _simulate_scenarios(self.scenarios, seed=self.seed, return_paths=PLOT_RESULTS)
 
         if PLOT_RESULTS:
             self.plot_results(all_results)
@@ -232,7 +330,7 @@ class SimulationEngine:
 
     def plot_results(self, all_results):
         # Combined Plotting for all Scenarios in one page
-        years_axis = list(range(1, self.years + 1))
+        years_axis = np.arange(1, self.years + 1)  # shared by every yearly trace
         fig = make_subplots(
             rows=3, cols=1,
             subplot_titles=(
@@ -248,7 +346,7 @@ class SimulationEngine:
             forecast_traces = plot_paths(investment_data_untaxed, self.years, bins=1000, return_traces=True)
             for trace in forecast_traces:
                 fig.add_trace(trace, row=1, col=1)
-            y_upper = max(max(trace['y']) for trace in forecast_traces if trace.__class__.__name__ == 'Scatter') * 1.1
+            y_upper = 1.1 * max(float(np.max(trace.y)) for trace in forecast_traces if isinstance(trace, go.Scatter))
             fig.update_yaxes(range=[0, y_upper], row=1, col=1)
 
         # Renting & Investing Scenario traces
@@ -273,7 +371,7 @@ class SimulationEngine:
             forecast_traces = plot_paths(investment_data_untaxed, self.years, bins=1000, return_traces=True)
             for trace in forecast_traces:
                 fig.add_trace(trace, row=3, col=1)
-            y_upper = max(max(trace['y']) for trace in forecast_traces if trace.__class__.__name__ == 'Scatter')*1.1
+            y_upper = 1.1 * max(float(np.max(trace.y)) for trace in forecast_traces if isinstance(trace, go.Scatter))
             fig.update_yaxes(range=[0, y_upper], row=3, col=1)
 
         fig.update_layout(height=900, title_text="Financial Simulation Scenarios")
@@ -283,7 +381,7 @@ class SimulationEngine:
 
 def main():
     # Initialize the financial profile from constants
-    USER_FREE_INCOME = [[10000] * 12 for _ in range(SIMULATION_YEARS)]  # in ILS for every simulation month
+    USER_FREE_INCOME = np.full((SIMULATION_YEARS, 12), 10000.0)  # in ILS for every simulation month
     USER_SAVINGS = 500000  # Current savings in ILS
 
     user_profile = FinancialProfile(
@@ -360,9 +458,10 @@ def main():
     # Create and run the simulation engine with all scenarios
     engine = SimulationEngine(
         profile=user_profile,
-        scenarios=[buying, investment],
+        scenarios=(buying, investment),
         start_date=SIMULATION_START_DATE,
-        years=SIMULATION_YEARS
+        years=SIMULATION_YEARS,
+        seed=RANDOM_SEED
     )
     engine.run()
 
@@ -5,6 +5,148 @@ this calculator assumes a "SHPITZER" return system: the monthly return is fixed
 import numpy as np
 import humanize
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from numba import njit
+
+# Column order of the numeric amortization_array kept next to each amortization_schedule
+AMORTIZATION_COLUMNS = ("total_payment", "interest_payment", "principal_payment", "remaining_balance")
+
+
+class ScheduleEntry(NamedTuple):
+    """
+    One period of an amortization schedule, with the amounts formatted as whole ILS.
+    Fields can also be read by name, entry["total_payment"], like the dicts the
+    schedule used to be made of. Aggregated multi-track entries have no single
+    rate to report, so their current_interest_rate is None (the old total dicts
+    left the key out).
+    """
+    period: object
+    total_payment: str
+    interest_payment: str
+    principal_payment: str
+    remaining_balance: str
+    current_interest_rate: Optional[str] = None  # not set on aggregated multi-track entries
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return self._fields
+
+
+class AmortizationSchedule(Sequence):
+    """
+    Formatted view of an amortization_array. The numbers stay in the int64 array
+    (one column per AMORTIZATION_COLUMNS entry); a ScheduleEntry of comma-formatted
+    strings is only built when a period is read.
+    """
+    __slots__ = ("_rows", "_rates", "_humanize_period")
+
+    def __init__(self, rows, rates=None, humanize_period=False):
+        self._rows = rows
+        self._rates = rates  # whole-percent rate per period, or None for aggregated schedules
+        self._humanize_period = humanize_period
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _entry(self, index, row):
+        period = humanize.intcomma(index + 1) if self._humanize_period else index + 1
+        rate = None if self._rates is None else humanize.intcomma(self._rates[index])
+        return ScheduleEntry(period, *(humanize.intcomma(value) for value in row), rate)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]  # normalizes negative indices, raises IndexError
+        return self._entry(index, self._rows[index].tolist())
+
+    def __iter__(self):
+        for index, row in enumerate(self._rows.tolist()):
+            yield self._entry(index, row)
+
+    def __repr__(self):
+        return f"AmortizationSchedule({list(self)!r})"
+
+
+@lru_cache(maxsize=4096)
+def _annuity_payment(interest_rate, principal, term_months):
+    """
+    Annuity payment for an annual interest rate (percent), memoized: mortgages built
+    with the same parameters recompute the same payments. The arguments are the
+    exact floats, so a cache hit returns exactly what the formula would.
+    """
+    n = term_months
+    mr = interest_rate / 12 / 100 # monthly interest rate
+
+    if mr == 0: # Handle zero interest rate
+        if n == 0: # Avoid division by zero if term is zero (though unlikely for valid loans)
+            return principal
+        payment = principal / n
+    else:
+        payment = principal * (mr * (1 + mr) ** n) / ((1 + mr) ** n - 1)
+    return payment
+
+
+@njit(cache=True)
+def _variable_rate_amortization(principal, annual_rates):
+    """
+    Compiled version of the BaseMortgage period loop for unlinked mortgages whose
+    rate may change every period: the annuity payment is recomputed each period
+    from the current balance and the remaining term, with the same arithmetic as
+    _calc_monthly_payment.
+    """
+    n_periods = annual_rates.shape[0]
+    payments = np.empty(n_periods)
+    interest = np.empty(n_periods)
+    principal_paid = np.empty(n_periods)
+    balances = np.empty(n_periods)
+    balance = principal
+    for i in range(n_periods):
+        remaining_term = n_periods - i
+        mr = annual_rates[i] / 12 / 100
+        if mr == 0:
+            payment = balance / remaining_term
+        else:
+            growth = (1 + mr) ** remaining_term
+            payment = balance * (mr * growth) / (growth - 1)
+        interest_payment = balance * mr
+        payments[i] = payment
+        interest[i] = interest_payment
+        principal_paid[i] = payment - interest_payment
+        balance = balance - (payment - interest_payment)
+        balances[i] = balance
+    return payments, interest, principal_paid, balances
+
+
+def _straight_line_amortization(principal, term_months):
+    """
+    Schedule of an interest-free loan: every period repays principal / n and the
+    balance falls linearly, so there is no annuity math to do.
+    """
+    payments = np.full(term_months, principal / term_months)
+    balances = principal - payments[0] * np.arange(1, term_months + 1) if term_months else np.zeros(0)
+    return payments, np.zeros(term_months), payments, balances
+
+
+def _cpi_period_ratios(cpi_list, cpi_baseline):
+    """
+    Inflation ratio applied to a linked balance at the end of each period: the
+    period's CPI over the previous period's (over the baseline for the first
+    period), or 1.0 where the divisor is zero. Computed once per mortgage and
+    returned as a list of floats for cheap indexing in the period loop.
+    """
+    cpi = np.asarray(cpi_list, dtype=np.float64)
+    previous = np.concatenate(([cpi_baseline], cpi[:-1]))
+    ratios = np.divide(cpi, previous, out=np.ones_like(cpi), where=previous != 0)
+    return ratios.tolist()
+
 
 class BaseMortgage(ABC):
     """Base class for all mortgage types."""
@@ -15,22 +157,14 @@ class BaseMortgage(ABC):
         self.term_years = term_years             # Loan term in years
         self.term_months = term_years * 12
         self.amortization_schedule = None
+        self.amortization_array = None
 
     def _calc_monthly_payment(self, interest_rate, principal, term_months):
         '''
         this method is the core logic of the calculator.
         it implements the annuity formula for a series of payments, a basic formula in finance.
         '''
-        n = term_months
-        mr = interest_rate / 12 / 100 # monthly interest rate
-
-        if mr == 0: # Handle zero interest rate
-            if n == 0: # Avoid division by zero if term is zero (though unlikely for valid loans)
-                return principal 
-            payment = principal / n
-        else:
-            payment = principal * (mr * (1 + mr) ** n) / ((1 + mr) ** n - 1)
-        return payment
+        return _annuity_payment(interest_rate, principal, term_months)
 
     def get_total_remaining_liabilities(self, current_period):
         """Calculate total remaining liabilities (sum of future payments) from the given period onward."""
@@ -47,16 +181,39 @@ class BaseMortgage(ABC):
         return total_interest
 
     def get_payment_list(self):
-        return [int(period['total_payment'].replace(",", "")) for period in self.amortization_schedule]
+        return self.amortization_array[:, 0].tolist()
 
     def calc_amortization_schedule(self):
         """
         Template method to calculate the full amortization schedule.
-        Loops over each period and delegates period-specific parameter calculations.
+        The numeric per-period values come from _calc_amortization_arrays (a period
+        loop by default, closed-form or compiled in some subclasses); this method
+        only truncates them to whole ILS; entries are formatted when they are read.
+        The schedule depends only on the constructor parameters, so it is built once
+        and later calls return the stored one.
+        """
+        if self.amortization_schedule is not None:
+            return self.amortization_schedule
+
+        payments, interest, principal, balances, rates = self._calc_amortization_arrays()
+        # astype truncates toward zero, exactly like int()
+        rows = np.column_stack((payments, interest, principal, balances)).astype(np.int64)
+        rows = rows.reshape(-1, len(AMORTIZATION_COLUMNS))
 
-        first pay according to current balance, then calc remaining principal
+        rates = np.asarray(rates, dtype=np.float64).astype(np.int64).tolist()
+        schedule = AmortizationSchedule(rows, rates)
+
+        self.amortization_schedule = schedule
+        self.amortization_array = rows
+        return schedule
+
+    def _calc_amortization_arrays(self):
         """
-        schedule = []
+        Per-period payment, interest, principal, remaining balance and annual rate (percent).
+        Loops over each period and delegates period-specific parameter calculations:
+        first pay according to current balance, then calc remaining principal.
+        """
+        payments, interest, principal, balances, rates = [], [], [], [], []
         current_balance = self.principal
 
         for period in range(1, self.term_months + 1):
@@ -70,19 +227,14 @@ class BaseMortgage(ABC):
             # Update the balance (subclasses can override _update_balance if needed)
             new_balance = self._update_balance(current_balance, principal_payment, period)
 
-            # Record details for this period
-            schedule.append({
-                "period": period,
-                "total_payment": humanize.intcomma(int(monthly_payment)),
-                "interest_payment": humanize.intcomma(int(interest_payment)),
-                "principal_payment": humanize.intcomma(int(principal_payment)),
-                "remaining_balance": humanize.intcomma(int(new_balance)),
-                "current_interest_rate": humanize.intcomma(int(period_interest_rate)),
-            })
+            payments.append(monthly_payment)
+            interest.append(interest_payment)
+            principal.append(principal_payment)
+            balances.append(new_balance)
+            rates.append(period_interest_rate)
             current_balance = new_balance
 
-        self.amortization_schedule = schedule
-        return schedule
+        return payments, interest, principal, balances, rates
 
     @abstractmethod
     def _get_period_interest_rate(self, period):
@@ -92,6 +244,11 @@ class BaseMortgage(ABC):
         """
         raise NotImplementedError("Subclasses should implement this method.")
 
+    def _period_interest_rates(self):
+        """Annual interest rate (percent) of every period as a float64 array."""
+        return np.array([self._get_period_interest_rate(period) for period in range(1, self.term_months + 1)],
+                        dtype=np.float64)
+
     def _update_balance(self, current_balance, principal_payment, period):
         """
         Default balance update: simply subtract the principal payment.
@@ -109,6 +266,24 @@ class FixedUnlinked(BaseMortgage):
     def _get_period_interest_rate(self, period):
         return self.interest_rate
 
+    def _calc_amortization_arrays(self):
+        """
+        Closed form of the fixed-rate schedule: with growth g_k = (1 + r)^k the balance
+        after k payments is B_k = P g_k - PMT (g_k - 1) / r, so all periods are
+        computed at once instead of stepping through them.
+        """
+        n = self.term_months
+        mr = self.interest_rate / 12 / 100
+        if mr == 0:
+            return (*_straight_line_amortization(float(self.principal), n), np.zeros(n))
+        payment = self._calc_monthly_payment(self.interest_rate, self.principal, n)
+        growth = (1 + mr) ** np.arange(n + 1)
+        all_balances = self.principal * growth - payment * (growth - 1) / mr
+        balances = all_balances[1:]
+        interest = all_balances[:-1] * mr
+        payments = np.full(n, float(payment))
+        return payments, interest, payments - interest, balances, np.full(n, float(self.interest_rate))
+
 
 class PrimeUnlinked(BaseMortgage):
     """Prime-linked variable mortgage using a list of prime rates for each period."""
@@ -121,6 +296,12 @@ class PrimeUnlinked(BaseMortgage):
         current_prime_rate = self.prime_rate_list[period - 1]
         return current_prime_rate + self.spread
 
+    def _calc_amortization_arrays(self):
+        rates = self._period_interest_rates()
+        if not rates.any():
+            return (*_straight_line_amortization(float(self.principal), self.term_months), rates)
+        return (*_variable_rate_amortization(float(self.principal), rates), rates)
+
 
 class LinkedFixed(BaseMortgage):
     """
@@ -135,27 +316,14 @@ class LinkedFixed(BaseMortgage):
         self.real_interest_rate = real_interest_rate  # Fixed real annual interest rate (percent)
         self.cpi_list = cpi_list  # List of CPI rise values for each month
         self.cpi_baseline = 100.0 # self.real_balance removed
+        self._cpi_ratios = _cpi_period_ratios(cpi_list, self.cpi_baseline)
 
     def _get_period_interest_rate(self, period):
         return self.real_interest_rate
 
     def _update_balance(self, current_nominal_balance_at_period_start, nominal_principal_payment_for_period, period):
         balance_after_payment = current_nominal_balance_at_period_start - nominal_principal_payment_for_period
-        cpi_for_current_period_end = self.cpi_list[period - 1] # CPI at the end of the current period
-        
-        if period == 1:
-            if self.cpi_baseline == 0: # Avoid division by zero
-                inflation_ratio = 1.0
-            else:
-                inflation_ratio = cpi_for_current_period_end / self.cpi_baseline
-        else:
-            cpi_for_previous_period_end = self.cpi_list[period - 2]
-            if cpi_for_previous_period_end == 0: # Avoid division by zero
-                inflation_ratio = 1.0
-            else:
-                inflation_ratio = cpi_for_current_period_end / cpi_for_previous_period_end
-                
-        return balance_after_payment * inflation_ratio
+        return balance_after_payment * self._cpi_ratios[period - 1]
 
 
 class AdjustableUnlinked(BaseMortgage):
@@ -177,6 +345,10 @@ class AdjustableUnlinked(BaseMortgage):
             else:
                 return self.reference_index[-1]
 
+    def _calc_amortization_arrays(self):
+        rates = self._period_interest_rates()
+        return (*_variable_rate_amortization(float(self.principal), rates), rates)
+
 
 class AdjustableLinked(BaseMortgage): 
     """5-Year Adjustable CPI-Linked (Mishtana Tzmeda) mortgage."""
@@ -188,6 +360,7 @@ class AdjustableLinked(BaseMortgage):
         self.reference_index = reference_index
         self.cpi_list = cpi_list
         self.cpi_baseline = 100.0 # self.real_balance removed
+        self._cpi_ratios = _cpi_period_ratios(cpi_list, self.cpi_baseline)
 
     def _get_period_interest_rate(self, period):
         # period is 1-indexed (month number)
@@ -207,21 +380,7 @@ class AdjustableLinked(BaseMortgage):
 
     def _update_balance(self, current_nominal_balance_at_period_start, nominal_principal_payment_for_period, period):
         balance_after_payment = current_nominal_balance_at_period_start - nominal_principal_payment_for_period
-        cpi_for_current_period_end = self.cpi_list[period - 1] # CPI at the end of the current period
-        
-        if period == 1:
-            if self.cpi_baseline == 0: # Avoid division by zero
-                inflation_ratio = 1.0
-            else:
-                inflation_ratio = cpi_for_current_period_end / self.cpi_baseline
-        else:
-            cpi_for_previous_period_end = self.cpi_list[period - 2]
-            if cpi_for_previous_period_end == 0: # Avoid division by zero
-                inflation_ratio = 1.0
-            else:
-                inflation_ratio = cpi_for_current_period_end / cpi_for_previous_period_end
-                
-        return balance_after_payment * inflation_ratio
+        return balance_after_payment * self._cpi_ratios[period - 1]
 
 class MultiTrackMortgage:
     """
@@ -235,6 +394,8 @@ class MultiTrackMortgage:
             multi = MultiTrackMortgage(fixed=fixed_mortgage, prime=prime_mortgage)
         """
         self.mortgage_tracks = mortgage_tracks
+        self.amortization_schedule = None
+        self.amortization_array = None
         self.calc_total_loan_value()
         self.calc_amortization_schedule()
 
@@ -255,43 +416,27 @@ class MultiTrackMortgage:
         Aggregate the individual amortization schedules into one total schedule.
         For each period (as found in any track), sum numeric values for keys except 'period'
         and 'current_interest_rate'. If a track has ended by a given period, it is ignored.
+        The aggregated entries carry current_interest_rate=None.
+        The tracks' schedules are fixed once built, so the aggregate is computed once
+        and later calls return the stored one.
         """
+        if self.amortization_schedule is not None:
+            return self.amortization_schedule
+
         self.calc_individual_schedules()
-        aggregated = {}
-        ignored_keys = ["period", "current_interest_rate"]
 
-        # Iterate over each track's schedule.
+        # Sum the numeric track arrays period by period (shorter tracks count as zero),
+        # rather than re-parsing every track's formatted strings.
+        n_periods = max((len(track.amortization_array) for track in self.mortgage_tracks.values()), default=0)
+        total_array = np.zeros((n_periods, len(AMORTIZATION_COLUMNS)), dtype=np.int64)
         for track in self.mortgage_tracks.values():
-            for entry in track.amortization_schedule:
-                # Convert the humanized 'period' string back to an integer.
-                period = entry["period"]
-                if period not in aggregated:
-                    # Initialize an entry for this period.
-                    aggregated[period] = {"period": period}
-                    # Set initial sums for every key except 'period' and 'current_interest_rate'
-                    for key in entry:
-                        if key not in ignored_keys:
-                            aggregated[period][key] = 0
-
-                # Sum up values from this entry (ignoring 'current_interest_rate')
-                for key, value in entry.items():
-                    if key in ignored_keys:
-                        continue
-                    aggregated[period][key] += int(value.replace(",", ""))
-
-        # Build a sorted list of aggregated entries.
-        total_schedule = []
-        for period in sorted(aggregated.keys()):
-            entry = aggregated[period]
-            # Humanize the period number.
-            entry["period"] = humanize.intcomma(entry["period"])
-            # Optionally humanize other numeric values.
-            for key in entry:
-                if key != "period":
-                    entry[key] = humanize.intcomma(entry[key])
-            total_schedule.append(entry)
+            total_array[:len(track.amortization_array)] += track.amortization_array
+
+        # Format the totals like the track schedules; the period number is humanized too.
+        total_schedule = AmortizationSchedule(total_array, humanize_period=True)
 
         self.amortization_schedule = total_schedule
+        self.amortization_array = total_array
         return total_schedule
 
     def get_track_schedule(self, track_name):
@@ -322,8 +467,12 @@ class MultiTrackMortgage:
         return total_interest
 
     def get_payment_list(self):
-        track_lists = [track.get_payment_list() for track in self.mortgage_tracks.values()]
-        return [sum(monthly) for monthly in zip(*track_lists)]
+        # Periods covered by every track, as the per-track payment lists were zipped before
+        track_arrays = [track.amortization_array[:, 0] for track in self.mortgage_tracks.values()]
+        if not track_arrays:
+            return []
+        n_periods = min(len(payments) for payments in track_arrays)
+        return sum(payments[:n_periods] for payments in track_arrays).tolist()
 
 
 
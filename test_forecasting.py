@@ -0,0 +1,119 @@
+import unittest
+import warnings
+from unittest import mock
+import numpy as np
+import plotly.graph_objects as go
+from forecasting import GBM_METHODS, simulate_gbm, summarize_gbm, plot_forecast_analytical
+
+S0, MU, SIGMA, DT = 100.0, 0.05, 0.15, 1 / 12
+
+
+class TestSimulateGBM(unittest.TestCase):
+
+    def test_shape_and_dtype(self):
+        for method in GBM_METHODS:
+            with self.subTest(method=method):
+                paths = simulate_gbm(S0, MU, SIGMA, T=2, dt=DT, n_simulations=64, seed=3, method=method)
+                self.assertEqual(paths.shape, (25, 64))
+                self.assertEqual(paths.dtype, np.float32)
+                np.testing.assert_array_equal(paths[0], S0)
+                self.assertTrue(np.isfinite(paths).all())
+                self.assertTrue((paths > 0).all())
+
+    def test_seed_reproducibility(self):
+        for method in GBM_METHODS:
+            with self.subTest(method=method):
+                first = simulate_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=32, seed=5, method=method)
+                second = simulate_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=32, seed=5, method=method)
+                other = simulate_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=32, seed=6, method=method)
+                np.testing.assert_array_equal(first, second)
+                self.assertFalse(np.array_equal(first, other))
+
+    def test_unknown_method_raises(self):
+        with self.assertRaises(ValueError):
+            simulate_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=4, method='bogus')
+
+    def test_antithetic_pairing(self):
+        # Column j and column half + j are driven by mirrored shocks, so their log
+        # returns sum to twice the drift at every step.
+        for n_simulations in (10, 11):
+            with self.subTest(n_simulations=n_simulations):
+                paths = simulate_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=n_simulations, seed=2,
+                                     method='antithetic').astype(np.float64)
+                half = n_simulations // 2
+                t = np.arange(paths.shape[0]) * DT
+                log_sum = np.log(paths[:, :half] / S0) + np.log(paths[:, half:2 * half] / S0)
+                np.testing.assert_allclose(log_sum, np.repeat(2 * (MU - 0.5 * SIGMA ** 2) * t[:, None], half, axis=1),
+                                           atol=1e-5)
+
+    def test_moment_matched_single_path(self):
+        # One path has zero sample std; it must fall back to the raw draws instead of NaN.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            paths = simulate_gbm(S0=100, mu=0.05, sigma=0.15, T=1, dt=1 / 12, n_simulations=1,
+                                 seed=1, method='moment_matched')
+        self.assertEqual(paths.shape, (13, 1))
+        self.assertTrue(np.isfinite(paths).all())
+        np.testing.assert_array_equal(paths, simulate_gbm(S0=100, mu=0.05, sigma=0.15, T=1, dt=1 / 12,
+                                                          n_simulations=1, seed=1, method='pseudo'))
+
+    def test_moment_matched_standardizes_each_step(self):
+        paths = simulate_gbm(S0=100, mu=0.05, sigma=0.15, T=1, dt=1 / 12, n_simulations=1000,
+                             seed=1, method='moment_matched')
+        self.assertTrue(np.isfinite(paths).all())
+        # Every step's log-return shocks have zero mean and unit variance.
+        dt = 1 / 12
+        log_returns = np.diff(np.log(paths.astype(np.float64)), axis=0)
+        z = (log_returns - (0.05 - 0.5 * 0.15 ** 2) * dt) / (0.15 * np.sqrt(dt))
+        np.testing.assert_allclose(z.mean(axis=1), 0, atol=1e-3)
+        np.testing.assert_allclose(z.std(axis=1), 1, atol=1e-3)
+        # So the mean terminal log return hits the GBM target exactly (up to float32 rounding)
+        self.assertAlmostEqual(float(np.log(paths[-1].astype(np.float64) / 100).mean()),
+                               (0.05 - 0.5 * 0.15 ** 2) * 1, places=5)
+
+
+class TestSummarizeGBM(unittest.TestCase):
+
+    def test_quantiles_match_full_paths(self):
+        # One batch reads the same stream as simulate_gbm, so the histogram quantiles
+        # should agree with np.quantile on the full matrix to within a bin.
+        n_simulations = 4000
+        summary = summarize_gbm(S0, MU, SIGMA, T=2, dt=DT, n_simulations=n_simulations, seed=11,
+                                batch_size=n_simulations)
+        paths = simulate_gbm(S0, MU, SIGMA, T=2, dt=DT, n_simulations=n_simulations, seed=11)
+        expected = np.quantile(paths.astype(np.float64), [0.1, 0.5, 0.9], axis=1)
+        for key, row in zip(('q10', 'q50', 'q90'), expected):
+            with self.subTest(quantile=key):
+                np.testing.assert_allclose(summary[key], row, rtol=2e-3)
+        self.assertAlmostEqual(summary['s_min'], float(paths.min()), places=3)
+        self.assertAlmostEqual(summary['s_max'], float(paths.max()), places=3)
+        # The CDF at the median is about one half
+        self.assertAlmostEqual(float(summary['cdf']([summary['q50'][-1]], len(summary['t']) - 1)[0]), 0.5, places=2)
+
+    def test_batches_continue_one_stream(self):
+        # Smaller batches draw the same values as one big batch would from the shared Generator
+        whole = summarize_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=3000, seed=4, batch_size=3000)
+        batched = summarize_gbm(S0, MU, SIGMA, T=1, dt=DT, n_simulations=3000, seed=4, batch_size=1000)
+        for key in ('q10', 'q50', 'q90'):
+            np.testing.assert_allclose(batched[key], whole[key], rtol=1e-2)
+
+
+class TestPlotForecastAnalytical(unittest.TestCase):
+
+    def test_percentile_lines_are_lognormal(self):
+        with mock.patch.object(go.Figure, 'show'):
+            heatmap, q10, q90, q50 = plot_forecast_analytical(S0, MU, SIGMA, years=5, bins=200,
+                                                              return_traces=True)
+        t = np.asarray(q50.x)
+        np.testing.assert_allclose(q50.y, S0 * np.exp((MU - 0.5 * SIGMA ** 2) * t))
+        # Compare with a large simulation at the horizon
+        paths = simulate_gbm(S0, MU, SIGMA, T=5, dt=DT, n_simulations=20000, seed=1)
+        np.testing.assert_allclose([q10.y[-1], q50.y[-1], q90.y[-1]],
+                                   np.quantile(paths[-1], [0.1, 0.5, 0.9]), rtol=0.02)
+        density = np.asarray(heatmap.z)
+        self.assertTrue(((density >= 0) & (density <= 100)).all())
+        self.assertTrue((np.diff(density, axis=0) >= 0).all())  # a CDF rises along the value axis
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+import numpy as np
+from functions import simulate_investment
+
+
+class TestSimulateInvestment(unittest.TestCase):
+
+    def test_short_contributions_schedule_raises(self):
+        # One year of contributions can't drive a 30-year simulation.
+        with self.assertRaises(ValueError):
+            simulate_investment(initial_fortune=1000, years=30, tax_rate=25,
+                                contributions_schedule=[[1000] * 12], n_sim=10, rng=0)
+
+    def test_every_month_is_simulated(self):
+        result = simulate_investment(initial_fortune=1000, years=2, tax_rate=25,
+                                     contributions_schedule=[[1000] * 12] * 3, n_sim=10, rng=0)
+        paths = result['final_investment_paths_untaxed']
+        self.assertEqual(paths.shape, (25, 10))
+        self.assertTrue(np.isfinite(paths).all())
+        np.testing.assert_allclose(result['final_value_untaxed'], paths[-1], rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
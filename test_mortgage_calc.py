@@ -1,202 +1,180 @@
 import unittest
+import numpy as np
 from mortgage_calc import (
     FixedUnlinked, PrimeUnlinked, LinkedFixed, MultiTrackMortgage,
-    AdjustableUnlinked, AdjustableLinked, mortgage_factory
+    AdjustableUnlinked, AdjustableLinked, ScheduleEntry, mortgage_factory
 )
 
+# Loan shared by the 10-year tests
+PRINCIPAL_100K = 100_000
+TERM_YEARS_10 = 10
+TERM_MONTHS_10 = TERM_YEARS_10 * 12
+
+# Constant CPI and rate series shared by the tests (the mortgages only read them)
+CPI_BASELINE_120 = np.full(TERM_MONTHS_10, 100.0)
+CPI_BASELINE_360 = np.full(360, 100.0)
+PRIME_55_360 = np.full(360, 5.5)
+RATES_0_120 = np.zeros(TERM_MONTHS_10)
+RATES_5_120 = np.full(TERM_MONTHS_10, 5.0)
+
 # Helper function for parsing payment strings
 def parse_payment(value_str):
     return int(value_str.replace(",", ""))
 
 class TestMortgageCalc(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        # The mortgages are built once for the class; tests only read them.
         # Use a constant principal and term for tests.
-        self.principal = 1000000
-        self.term_years = 30
+        cls.principal = 1000000
+        cls.term_years = 30
 
 
-        self.months = self.term_years * 12
+        cls.months = cls.term_years * 12
 
         # FixedUnlinked: constant 5% interest
-        self.fixed_rate = 5
-        self.fixed_mortgage = FixedUnlinked(principal=self.principal,
-                                            term_years=self.term_years,
-                                            interest_rate=self.fixed_rate)
+        cls.fixed_rate = 5
+        cls.fixed_mortgage = FixedUnlinked(principal=cls.principal,
+                                           term_years=cls.term_years,
+                                           interest_rate=cls.fixed_rate)
 
         # PrimeUnlinked: prime rate list with constant value and a spread of -0.5%
-        self.prime_rate_list = [5.5] * self.months
-        self.spread = -0.5
-        self.prime_mortgage = PrimeUnlinked(principal=self.principal,
-                                            term_years=self.term_years,
-                                            prime_rate_list=self.prime_rate_list,
-                                            spread=self.spread)
+        cls.prime_rate_list = PRIME_55_360
+        cls.spread = -0.5
+        cls.prime_mortgage = PrimeUnlinked(principal=cls.principal,
+                                           term_years=cls.term_years,
+                                           prime_rate_list=cls.prime_rate_list,
+                                           spread=cls.spread)
 
         # LinkedFixed: real rate mortgage with a constant CPI (baseline) so no effective inflation change.
-        self.real_interest_rate = 5
-        self.cpi_list = [100] * self.months  # constant CPI baseline
-        self.linked_mortgage = LinkedFixed(principal=self.principal,
-                                           term_years=self.term_years,
-                                           real_interest_rate=self.real_interest_rate,
-                                           cpi_list=self.cpi_list)
+        cls.real_interest_rate = 5
+        cls.cpi_list = CPI_BASELINE_360  # constant CPI baseline
+        cls.linked_mortgage = LinkedFixed(principal=cls.principal,
+                                          term_years=cls.term_years,
+                                          real_interest_rate=cls.real_interest_rate,
+                                          cpi_list=cls.cpi_list)
 
         # AdjustableUnlinked
-        self.adjustable_unlinked_fixed_period = 5  # years
-        self.adjustable_unlinked_initial_rate = 3
-        self.adjustable_unlinked_reference_index = [3.5, 4.0, 4.5]  # Example index values
-        self.adjustable_unlinked_mortgage = AdjustableUnlinked(
-            principal=self.principal,
-            term_years=self.term_years,
-            fixed_period=self.adjustable_unlinked_fixed_period, # Changed fixed_period_years to fixed_period
-            initial_interest_rate=self.adjustable_unlinked_initial_rate,
-            reference_index=self.adjustable_unlinked_reference_index
+        cls.adjustable_unlinked_fixed_period = 5  # years
+        cls.adjustable_unlinked_initial_rate = 3
+        cls.adjustable_unlinked_reference_index = [3.5, 4.0, 4.5]  # Example index values
+        cls.adjustable_unlinked_mortgage = AdjustableUnlinked(
+            principal=cls.principal,
+            term_years=cls.term_years,
+            fixed_period=cls.adjustable_unlinked_fixed_period, # Changed fixed_period_years to fixed_period
+            initial_interest_rate=cls.adjustable_unlinked_initial_rate,
+            reference_index=cls.adjustable_unlinked_reference_index
         )
 
         # AdjustableLinked
-        self.adjustable_linked_fixed_period = 5  # years
-        self.adjustable_linked_initial_rate = 3
-        self.adjustable_linked_reference_index = [3.5, 4.0, 4.5]  # Example index values
-        self.adjustable_linked_mortgage = AdjustableLinked(
-            principal=self.principal,
-            term_years=self.term_years,
-            fixed_period=self.adjustable_linked_fixed_period, # Changed fixed_period_years to fixed_period
-            initial_interest_rate=self.adjustable_linked_initial_rate,
-            reference_index=self.adjustable_linked_reference_index,
-            cpi_list=self.cpi_list  # Using the same constant CPI list for baseline
+        cls.adjustable_linked_fixed_period = 5  # years
+        cls.adjustable_linked_initial_rate = 3
+        cls.adjustable_linked_reference_index = [3.5, 4.0, 4.5]  # Example index values
+        cls.adjustable_linked_mortgage = AdjustableLinked(
+            principal=cls.principal,
+            term_years=cls.term_years,
+            fixed_period=cls.adjustable_linked_fixed_period, # Changed fixed_period_years to fixed_period
+            initial_interest_rate=cls.adjustable_linked_initial_rate,
+            reference_index=cls.adjustable_linked_reference_index,
+            cpi_list=cls.cpi_list  # Using the same constant CPI list for baseline
         )
 
         # MultiTrackMortgage with all five tracks
-        self.multi = MultiTrackMortgage(
-            fixed=self.fixed_mortgage,
-            prime=self.prime_mortgage,
-            linked=self.linked_mortgage,
-            adjustable_unlinked=self.adjustable_unlinked_mortgage,
-            adjustable_linked=self.adjustable_linked_mortgage
+        cls.multi = MultiTrackMortgage(
+            fixed=cls.fixed_mortgage,
+            prime=cls.prime_mortgage,
+            linked=cls.linked_mortgage,
+            adjustable_unlinked=cls.adjustable_unlinked_mortgage,
+            adjustable_linked=cls.adjustable_linked_mortgage
         )
 
     def test_fixed_mortgage_schedule(self):
         schedule = self.fixed_mortgage.calc_amortization_schedule()
         # Verify schedule length
         self.assertEqual(len(schedule), self.months)
-        # Check first period entry contains expected keys.
-        expected_keys = {"period", "total_payment", "interest_payment", "principal_payment", "remaining_balance", "current_interest_rate"}
-        self.assertTrue(expected_keys.issubset(schedule[0].keys()))
+        # Check first period entry is a full schedule entry, rate included.
+        self.assertIsInstance(schedule[0], ScheduleEntry)
+        self.assertIsNotNone(schedule[0]["current_interest_rate"])
 
     def test_linked_mortgage_schedule(self):
         schedule = self.linked_mortgage.calc_amortization_schedule()
         self.assertEqual(len(schedule), self.months)
-        expected_keys = {"period", "total_payment", "interest_payment", "principal_payment", "remaining_balance", "current_interest_rate"}
-        self.assertTrue(expected_keys.issubset(schedule[0].keys()))
+        self.assertIsInstance(schedule[0], ScheduleEntry)
+        self.assertIsNotNone(schedule[0]["current_interest_rate"])
 
     def test_multi_track_schedule(self):
         total_schedule = self.multi.amortization_schedule # Corrected to access attribute
         # The aggregated schedule length should equal the maximum number of periods among tracks.
         self.assertEqual(len(total_schedule), self.months)
 
-        # Iterate over all periods and verify that, for each period, the total_payment
-        # equals the sum of all individual track payments.
-        for i in range(self.months):
-            expected_sum_of_payments = (
-                parse_payment(self.fixed_mortgage.amortization_schedule[i]["total_payment"]) +
-                parse_payment(self.prime_mortgage.amortization_schedule[i]["total_payment"]) +
-                parse_payment(self.linked_mortgage.amortization_schedule[i]["total_payment"]) +
-                parse_payment(self.adjustable_unlinked_mortgage.amortization_schedule[i]["total_payment"]) +
-                parse_payment(self.adjustable_linked_mortgage.amortization_schedule[i]["total_payment"])
-            )
-            actual_total_payment = parse_payment(total_schedule[i]["total_payment"])
-            self.assertEqual(actual_total_payment, expected_sum_of_payments,
-                             msg=f"Mismatch at period {i + 1}: sum of individual payments != total aggregated payment")
+        # For each period the aggregated total_payment must equal the sum of all individual
+        # track payments (read from the numeric arrays).
+        tracks = [self.fixed_mortgage, self.prime_mortgage, self.linked_mortgage,
+                  self.adjustable_unlinked_mortgage, self.adjustable_linked_mortgage]
+        expected_sums_of_payments = np.sum([track.amortization_array[:, 0] for track in tracks], axis=0)
+        np.testing.assert_array_equal(self.multi.amortization_array[:, 0], expected_sums_of_payments,
+                                      err_msg="sum of individual payments != total aggregated payment")
+        # The formatted schedule is a view of the same array.
+        self.assertEqual(parse_payment(total_schedule[-1]["total_payment"]), expected_sums_of_payments[-1])
+        # Tracks have different rates, so the aggregated entries report none.
+        self.assertIsInstance(total_schedule[0], ScheduleEntry)
+        self.assertIsNone(total_schedule[0]["current_interest_rate"])
+        self.assertTrue(all(entry.current_interest_rate is None for entry in total_schedule))
 
     def test_adjustable_unlinked_schedule(self):
         schedule = self.adjustable_unlinked_mortgage.calc_amortization_schedule()
         # Verify schedule length
         self.assertEqual(len(schedule), self.months)
-        # Check first period entry contains expected keys.
-        expected_keys = {"period", "total_payment", "interest_payment", "principal_payment", "remaining_balance", "current_interest_rate"}
-        self.assertTrue(expected_keys.issubset(schedule[0].keys()))
+        # Check first period entry is a full schedule entry, rate included.
+        self.assertIsInstance(schedule[0], ScheduleEntry)
+        self.assertIsNotNone(schedule[0]["current_interest_rate"])
 
     def test_adjustable_linked_schedule(self):
         schedule = self.adjustable_linked_mortgage.calc_amortization_schedule()
         # Verify schedule length
         self.assertEqual(len(schedule), self.months)
-        # Check first period entry contains expected keys.
-        expected_keys = {"period", "total_payment", "interest_payment", "principal_payment", "remaining_balance", "current_interest_rate"}
-        self.assertTrue(expected_keys.issubset(schedule[0].keys()))
+        # Check first period entry is a full schedule entry, rate included.
+        self.assertIsInstance(schedule[0], ScheduleEntry)
+        self.assertIsNotNone(schedule[0]["current_interest_rate"])
 
     def test_zero_interest_fixed_unlinked(self):
-        principal = 100000
-        term_years = 10
-        term_months = term_years * 12
-        mortgage = FixedUnlinked(principal=principal, term_years=term_years, interest_rate=0)
+        mortgage = FixedUnlinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10, interest_rate=0)
         schedule = mortgage.calc_amortization_schedule()
 
-        expected_principal_payment = principal / term_months
+        expected_principal_payment = PRINCIPAL_100K / TERM_MONTHS_10
         for entry in schedule:
             self.assertEqual(parse_payment(entry["interest_payment"]), 0)
             self.assertEqual(parse_payment(entry["principal_payment"]), round(expected_principal_payment)) # Round due to potential float precision
             self.assertEqual(parse_payment(entry["total_payment"]), round(expected_principal_payment))
 
     def test_zero_interest_prime_unlinked(self):
-        principal = 100000
-        term_years = 10
-        term_months = term_years * 12
-        mortgage = PrimeUnlinked(principal=principal, term_years=term_years, prime_rate_list=[0]*term_months, spread=0)
+        mortgage = PrimeUnlinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10, prime_rate_list=RATES_0_120, spread=0)
         schedule = mortgage.calc_amortization_schedule()
 
-        expected_principal_payment = principal / term_months
-        for entry in schedule:
-            self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            # Allow for small differences due to how _calc_monthly_payment might handle exact zero rate with float division
-            self.assertAlmostEqual(parse_payment(entry["principal_payment"]), expected_principal_payment, delta=1)
-            self.assertAlmostEqual(parse_payment(entry["total_payment"]), expected_principal_payment, delta=1)
-
-    def test_zero_principal_fixed_unlinked(self):
-        mortgage = FixedUnlinked(principal=0, term_years=10, interest_rate=5)
-        schedule = mortgage.calc_amortization_schedule()
+        expected_principal_payment = PRINCIPAL_100K / TERM_MONTHS_10
         for entry in schedule:
-            self.assertEqual(parse_payment(entry["total_payment"]), 0)
             self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            self.assertEqual(parse_payment(entry["principal_payment"]), 0)
-            self.assertEqual(parse_payment(entry["remaining_balance"]), 0)
-
-    def test_zero_principal_prime_unlinked(self):
-        term_months = 10 * 12
-        mortgage = PrimeUnlinked(principal=0, term_years=10, prime_rate_list=[5]*term_months, spread=0)
-        schedule = mortgage.calc_amortization_schedule()
-        for entry in schedule:
-            self.assertEqual(parse_payment(entry["total_payment"]), 0)
-            self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            self.assertEqual(parse_payment(entry["principal_payment"]), 0)
-            self.assertEqual(parse_payment(entry["remaining_balance"]), 0)
-
-    def test_zero_principal_linked_fixed(self):
-        term_months = 10 * 12
-        mortgage = LinkedFixed(principal=0, term_years=10, real_interest_rate=3, cpi_list=[100]*term_months)
-        schedule = mortgage.calc_amortization_schedule()
-        for entry in schedule:
-            self.assertEqual(parse_payment(entry["total_payment"]), 0)
-            self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            self.assertEqual(parse_payment(entry["principal_payment"]), 0)
-            self.assertEqual(parse_payment(entry["remaining_balance"]), 0)
-
-    def test_zero_principal_adjustable_unlinked(self):
-        mortgage = AdjustableUnlinked(principal=0, term_years=10, initial_interest_rate=3, reference_index=[3.5,4], fixed_period=5)
-        schedule = mortgage.calc_amortization_schedule()
-        for entry in schedule:
-            self.assertEqual(parse_payment(entry["total_payment"]), 0)
-            self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            self.assertEqual(parse_payment(entry["principal_payment"]), 0)
-            self.assertEqual(parse_payment(entry["remaining_balance"]), 0)
+            self.assertEqual(parse_payment(entry["principal_payment"]), round(expected_principal_payment))
+            self.assertEqual(parse_payment(entry["total_payment"]), round(expected_principal_payment))
 
-    def test_zero_principal_adjustable_linked(self):
-        term_months = 10 * 12
-        mortgage = AdjustableLinked(principal=0, term_years=10, initial_interest_rate=3, reference_index=[3.5,4], fixed_period=5, cpi_list=[100]*term_months)
-        schedule = mortgage.calc_amortization_schedule()
-        for entry in schedule:
-            self.assertEqual(parse_payment(entry["total_payment"]), 0)
-            self.assertEqual(parse_payment(entry["interest_payment"]), 0)
-            self.assertEqual(parse_payment(entry["principal_payment"]), 0)
-            self.assertEqual(parse_payment(entry["remaining_balance"]), 0)
+    def test_zero_principal_all(self):
+        # Every mortgage type with a zero principal pays and owes nothing in any period.
+        cases = [
+            (FixedUnlinked, dict(interest_rate=5)),
+            (PrimeUnlinked, dict(prime_rate_list=RATES_5_120, spread=0)),
+            (LinkedFixed, dict(real_interest_rate=3, cpi_list=CPI_BASELINE_120)),
+            (AdjustableUnlinked, dict(initial_interest_rate=3, reference_index=[3.5, 4], fixed_period=5)),
+            (AdjustableLinked, dict(initial_interest_rate=3, reference_index=[3.5, 4], fixed_period=5,
+                                    cpi_list=CPI_BASELINE_120)),
+        ]
+        for mortgage_class, params in cases:
+            with self.subTest(mortgage_class=mortgage_class.__name__):
+                mortgage = mortgage_class(principal=0, term_years=TERM_YEARS_10, **params)
+                schedule = mortgage.calc_amortization_schedule()
+                self.assertEqual(len(schedule), TERM_MONTHS_10)
+                # All four numeric columns (total, interest, principal, balance) are zero.
+                np.testing.assert_array_equal(mortgage.amortization_array, 0)
 
     def test_short_term_fixed_unlinked(self):
         principal = 12000
@@ -230,18 +208,15 @@ class TestMortgageCalc(unittest.TestCase):
         self.assertAlmostEqual(total_principal_paid, principal, delta=10) # Increased delta for sum of potential errors
 
     def test_cpi_effect_on_linked_fixed(self):
-        principal = 100000
-        term_years = 10
-        term_months = term_years * 12
         real_interest_rate = 3
 
         # Scenario 1: No Inflation
-        cpi_list_no_inflation = [100] * term_months
-        lf_no_inflation = LinkedFixed(principal=principal, term_years=term_years, 
+        cpi_list_no_inflation = CPI_BASELINE_120
+        lf_no_inflation = LinkedFixed(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10, 
                                       real_interest_rate=real_interest_rate, cpi_list=cpi_list_no_inflation)
         schedule_lf_no_inflation = lf_no_inflation.calc_amortization_schedule()
 
-        fu_comparison = FixedUnlinked(principal=principal, term_years=term_years, interest_rate=real_interest_rate)
+        fu_comparison = FixedUnlinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10, interest_rate=real_interest_rate)
         schedule_fu_comparison = fu_comparison.calc_amortization_schedule()
 
         # Compare first month's total payment
@@ -252,36 +227,18 @@ class TestMortgageCalc(unittest.TestCase):
 
 
         # Scenario 2: With Inflation (2% annual)
-        cpi_list_with_inflation = [100] * term_months
+        # Stepped annual increase: the CPI rises by annual_inflation at the start of each year
         annual_inflation = 0.02
-        for year in range(term_years):
-            for month_in_year in range(12):
-                month_index = year * 12 + month_in_year
-                if year == 0 and month_in_year == 0: # Baseline CPI
-                    cpi_list_with_inflation[month_index] = 100
-                elif month_in_year == 0: # Start of a new year, apply annual inflation to previous year's start
-                     # Apply annual inflation based on the CPI at the start of the previous year
-                    cpi_list_with_inflation[month_index] = cpi_list_with_inflation[(year-1)*12] * (1 + annual_inflation)
-                else: # Carry over CPI from previous month within the same year
-                    cpi_list_with_inflation[month_index] = cpi_list_with_inflation[month_index-1]
-        # Distribute annual increase somewhat evenly for smoother monthly CPI if needed, or keep stepped.
-        # For simplicity, using stepped annual increase for this test.
-        # A more realistic monthly CPI would be (1+annual_inflation)**(1/12) applied monthly.
-        # Let's use a simple stepped annual increase for the test.
-        current_cpi = 100
-        for i in range(term_months):
-            if i > 0 and i % 12 == 0: # Apply annual inflation at the start of each year
-                current_cpi *= (1 + annual_inflation)
-            cpi_list_with_inflation[i] = current_cpi
-
-
-        lf_with_inflation = LinkedFixed(principal=principal, term_years=term_years,
+        cpi_list_with_inflation = 100.0 * (1 + annual_inflation) ** (np.arange(TERM_MONTHS_10) // 12)
+
+
+        lf_with_inflation = LinkedFixed(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10,
                                         real_interest_rate=real_interest_rate, cpi_list=cpi_list_with_inflation)
         schedule_lf_with_inflation = lf_with_inflation.calc_amortization_schedule()
 
         # Assert that total payment after inflation has taken effect is higher
         # (e.g. check payment at month 25, index 24, after two years of inflation)
-        if term_months > 24: 
+        if TERM_MONTHS_10 > 24: 
             payment_no_inflation_month25 = parse_payment(schedule_lf_no_inflation[24]["total_payment"])
             payment_with_inflation_month25 = parse_payment(schedule_lf_with_inflation[24]["total_payment"])
             self.assertGreater(payment_with_inflation_month25, payment_no_inflation_month25)
@@ -291,21 +248,18 @@ class TestMortgageCalc(unittest.TestCase):
 
 
     def test_cpi_effect_on_adjustable_linked(self):
-        principal = 100000
-        term_years = 10
-        term_months = term_years * 12
         initial_rate = 3
         reference_index = [3.5, 4.0] 
         fixed_period = 5
 
         # Scenario 1: No Inflation
-        cpi_list_no_inflation = [100] * term_months
-        al_no_inflation = AdjustableLinked(principal=principal, term_years=term_years, 
+        cpi_list_no_inflation = CPI_BASELINE_120
+        al_no_inflation = AdjustableLinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10, 
                                            initial_interest_rate=initial_rate, reference_index=reference_index,
                                            fixed_period=fixed_period, cpi_list=cpi_list_no_inflation)
         schedule_al_no_inflation = al_no_inflation.calc_amortization_schedule()
 
-        au_comparison = AdjustableUnlinked(principal=principal, term_years=term_years,
+        au_comparison = AdjustableUnlinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10,
                                            initial_interest_rate=initial_rate, reference_index=reference_index,
                                            fixed_period=fixed_period)
         schedule_au_comparison = au_comparison.calc_amortization_schedule()
@@ -318,22 +272,17 @@ class TestMortgageCalc(unittest.TestCase):
 
 
         # Scenario 2: With Inflation (2% annual)
-        cpi_list_with_inflation = [100] * term_months
         annual_inflation = 0.02
-        current_cpi = 100
-        for i in range(term_months):
-            if i > 0 and i % 12 == 0:
-                current_cpi *= (1 + annual_inflation)
-            cpi_list_with_inflation[i] = current_cpi
-            
-        al_with_inflation = AdjustableLinked(principal=principal, term_years=term_years,
+        cpi_list_with_inflation = 100.0 * (1 + annual_inflation) ** (np.arange(TERM_MONTHS_10) // 12)
+
+        al_with_inflation = AdjustableLinked(principal=PRINCIPAL_100K, term_years=TERM_YEARS_10,
                                              initial_interest_rate=initial_rate, reference_index=reference_index,
                                              fixed_period=fixed_period, cpi_list=cpi_list_with_inflation)
         schedule_al_with_inflation = al_with_inflation.calc_amortization_schedule()
 
         # Assert that total payment after inflation has taken effect is higher
         # (e.g. check payment at month 25, index 24, after two years of inflation)
-        if term_months > 24:
+        if TERM_MONTHS_10 > 24:
             payment_no_inflation_month25 = parse_payment(schedule_al_no_inflation[24]["total_payment"])
             payment_with_inflation_month25 = parse_payment(schedule_al_with_inflation[24]["total_payment"])
             self.assertGreater(payment_with_inflation_month25, payment_no_inflation_month25)
@@ -356,7 +305,7 @@ class TestMortgageFactory(unittest.TestCase):
                 "type": "prime", "principal": 100000, "term_years": 10, "interest_rate": 3, "spread": -0.2
             },
             "linked_test_track": {
-                "type": "linked", "principal": 100000, "term_years": 10, "real_interest_rate": 2.5, "cpi_list": [100]*120
+                "type": "linked", "principal": 100000, "term_years": 10, "real_interest_rate": 2.5, "cpi_list": CPI_BASELINE_120
             },
             "adjustable_test_track": {
                 "type": "adjustable", "principal": 100000, "term_years": 10, "initial_interest_rate": 2,
@@ -364,7 +313,7 @@ class TestMortgageFactory(unittest.TestCase):
             },
             "adjustablelinked_test_track": {
                 "type": "adjustablelinked", "principal": 100000, "term_years": 10, "initial_interest_rate": 2,
-                "reference_index": [2.5, 3], "fixed_period": 5, "cpi_list": [100]*120 # real_balance removed
+                "reference_index": [2.5, 3], "fixed_period": 5, "cpi_list": CPI_BASELINE_120 # real_balance removed
             }
         }
         multi_mortgage = mortgage_factory(mortgage_params)